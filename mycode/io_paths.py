@@ -10,7 +10,9 @@ Ensures consistent file organization across the entire ETL pipeline.
 """
 
 import os
+import pandas as pd
 from datetime import datetime, UTC
+from functools import cached_property
 from typing import Optional
 from pathlib import Path
 
@@ -21,40 +23,29 @@ class IOPaths:
         """Initialize all file paths with timestamp."""
         self.run_timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
         
-        # Base directories - relative to io_paths.py location
-        self.base_dir = Path(__file__).parent.parent  # Go up to 'crc' directory
-        self.csv_dir = self.base_dir / "csv files"
-        self.qa_dir = self.base_dir / "qa_reports"
-        self.raw_html_dir = self.base_dir / "raw_html"
-        self.raw_text_dir = self.base_dir / "raw_text"
-        self.archive_dir = self.base_dir / "archive"
+        # Base directories - relative to io_paths.py location, resolved once
+        # and kept as plain strings so path properties are simple joins
+        self.base_dir = str(Path(__file__).resolve().parent.parent)  # Go up to 'crc' directory
+        self.csv_dir = os.path.join(self.base_dir, "csv files")
+        self.qa_dir = os.path.join(self.base_dir, "qa_reports")
+        self.raw_html_dir = os.path.join(self.base_dir, "raw_html")
+        self.raw_text_dir = os.path.join(self.base_dir, "raw_text")
+        self.archive_dir = os.path.join(self.base_dir, "archive")
+        self.cache_dir = os.path.join(self.base_dir, "cache")
         
         # IMPORTANT: Create directories if they don't exist
-        for directory in [self.csv_dir, self.qa_dir, self.raw_html_dir, 
-                        self.raw_text_dir, self.archive_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
-    
-    def _create_directories(self):
-        """Create all required output directories."""
-        directories = [
-            self.csv_dir,
-            self.raw_html_dir,
-            self.raw_text_dir,
-            self.qa_dir,
-            self.archive_dir,
-        ]
-        
-        for directory in directories:
+        for directory in (self.csv_dir, self.qa_dir, self.raw_html_dir,
+                          self.raw_text_dir, self.archive_dir, self.cache_dir):
             os.makedirs(directory, exist_ok=True)
     
     # ==================== INPUT PATHS ====================
     
-    @property
+    @cached_property
     def census_input(self) -> str:
         """Path to input census CSV file."""
         return os.path.join(self.csv_dir, "Manitoba_2021_Census.csv")
     
-    @property
+    @cached_property
     def wildfire_input(self) -> str:
         """Path to latest scraped wildfire data (if exists)."""
         return os.path.join(self.csv_dir, "T1_Wildfire_Evacs.csv")
@@ -82,17 +73,17 @@ class IOPaths:
     
     # ==================== SCRAPED DATA OUTPUTS ====================
     
-    @property
+    @cached_property
     def scraped_metadata(self) -> str:
         """Path for metadata from scraping process."""
         return os.path.join(self.csv_dir, "T1_Data.csv")
     
-    @property
+    @cached_property
     def scraped_wildfire_latest(self) -> str:
         """Path for latest wildfire evacuation data (overwrites)."""
         return os.path.join(self.csv_dir, "T1_Wildfire_Evacs.csv")
     
-    @property
+    @cached_property
     def scraped_wildfire_versioned(self) -> str:
         """Path for versioned wildfire evacuation data."""
         filename = f"T1_Wildfire_Evacs_{self.run_timestamp}.csv"
@@ -100,41 +91,70 @@ class IOPaths:
     
     # ==================== CLEANED DATA OUTPUTS ====================
     
-    @property
+    @cached_property
     def cleaned_wildfire(self) -> str:
         """Path for cleaned wildfire data."""
         return os.path.join(self.csv_dir, "T1_Wildfire_Evacs_cleaned.csv")
     
-    @property
+    @cached_property
     def cleaned_census(self) -> str:
         """Path for cleaned census lookup table."""
         return os.path.join(self.csv_dir, "census_lookup_cleaned.csv")
     
+    # ==================== INTERMEDIATE (PARQUET) OUTPUTS ====================
+    # Pipeline-internal copies of the latest/cleaned/enriched tables; the CSVs
+    # remain the human-facing versions.
+    
+    @cached_property
+    def scraped_wildfire_parquet(self) -> str:
+        """Parquet copy of latest wildfire evacuation data."""
+        return os.path.join(self.csv_dir, "T1_Wildfire_Evacs.parquet")
+    
+    @cached_property
+    def cleaned_wildfire_parquet(self) -> str:
+        """Parquet copy of cleaned wildfire data."""
+        return os.path.join(self.csv_dir, "T1_Wildfire_Evacs_cleaned.parquet")
+    
+    @cached_property
+    def cleaned_census_parquet(self) -> str:
+        """Parquet copy of cleaned census lookup table."""
+        return os.path.join(self.csv_dir, "census_lookup_cleaned.parquet")
+    
+    @cached_property
+    def authority_mapping_parquet(self) -> str:
+        """Parquet copy of authority-to-DGUID mapping table."""
+        return os.path.join(self.csv_dir, "authority_to_dguid_mapping.parquet")
+    
+    @cached_property
+    def enriched_wildfire_parquet(self) -> str:
+        """Parquet copy of latest enriched wildfire data."""
+        return os.path.join(self.csv_dir, "T1_Wildfire_Evacs_Enriched.parquet")
+    
     # ==================== MATCHING OUTPUTS ====================
     
-    @property
+    @cached_property
     def authority_mapping(self) -> str:
         """Path for authority-to-DGUID mapping table."""
         return os.path.join(self.csv_dir, "authority_to_dguid_mapping.csv")
     
-    @property
+    @cached_property
     def unmatched_authorities(self) -> str:
         """Path for list of unmatched authorities."""
         return os.path.join(self.csv_dir, "unmatched_authorities.csv")
     
-    @property
+    @cached_property
     def low_confidence_matches(self) -> str:
         """Path for low-confidence matches requiring review."""
         return os.path.join(self.csv_dir, "low_confidence_matches.csv")
     
     # ==================== ENRICHED DATA OUTPUTS ====================
     
-    @property
+    @cached_property
     def enriched_wildfire_latest(self) -> str:
         """Path for latest enriched wildfire data (overwrites)."""
         return os.path.join(self.csv_dir, "T1_Wildfire_Evacs_Enriched.csv")
     
-    @property
+    @cached_property
     def enriched_wildfire_versioned(self) -> str:
         """Path for versioned enriched wildfire data."""
         filename = f"T1_Wildfire_Evacs_Enriched_{self.run_timestamp}.csv"
@@ -142,25 +162,25 @@ class IOPaths:
     
     # ==================== QA REPORT OUTPUTS ====================
     
-    @property
+    @cached_property
     def qa_report_scraping(self) -> str:
         """Path for scraping QA report."""
         filename = f"QA_Scraping_{self.run_timestamp}.txt"
         return os.path.join(self.qa_dir, filename)
     
-    @property
+    @cached_property
     def qa_report_matching(self) -> str:
         """Path for matching QA report."""
         filename = f"QA_Matching_{self.run_timestamp}.txt"
         return os.path.join(self.qa_dir, filename)
     
-    @property
+    @cached_property
     def qa_report_pipeline(self) -> str:
         """Path for overall pipeline QA report."""
         filename = f"QA_Pipeline_{self.run_timestamp}.txt"
         return os.path.join(self.qa_dir, filename)
     
-    @property
+    @cached_property
     def authority_audit(self) -> str:
         """Path for authority frequency audit."""
         return os.path.join(self.csv_dir, "authority_audit.csv")
@@ -179,6 +199,42 @@ class IOPaths:
         """
         return os.path.join(self.archive_dir, filename)
     
+    # ==================== CACHE FILES ====================
+    
+    @cached_property
+    def http_cache(self) -> str:
+        """Path for conditional-GET cache of scraped pages (ETag/Last-Modified)."""
+        return os.path.join(self.cache_dir, "t1_http_cache.json")
+    
+    def gnbc_cache(self, key: str) -> str:
+        """
+        Path for a cached GNBC API response.
+        
+        Args:
+            key (str): Hash of the request (province and entity types)
+            
+        Returns:
+            str: Full path for cached JSON response
+        """
+        return os.path.join(self.cache_dir, f"gnbc_{key}.json")
+    
+    @cached_property
+    def census_profile_cache(self) -> str:
+        """Path for the cached Census Profile extract from the StatCan API."""
+        return os.path.join(self.cache_dir, "census_profile_MB_2021.parquet")
+    
+    def census_lookup_cache(self, signature: str) -> str:
+        """
+        Path for a cached cleaned census lookup.
+        
+        Args:
+            signature (str): Signature of the source census file (version_size_contenthash)
+            
+        Returns:
+            str: Full path for cached Parquet lookup
+        """
+        return os.path.join(self.cache_dir, f"census_lookup_{signature}.parquet")
+    
     # ==================== UTILITY METHODS ====================
     
     def get_all_outputs(self) -> dict:
@@ -196,6 +252,11 @@ class IOPaths:
             "Scraped Wildfire (Versioned)": self.scraped_wildfire_versioned,
             "Cleaned Wildfire": self.cleaned_wildfire,
             "Cleaned Census": self.cleaned_census,
+            "Scraped Wildfire (Parquet)": self.scraped_wildfire_parquet,
+            "Cleaned Wildfire (Parquet)": self.cleaned_wildfire_parquet,
+            "Cleaned Census (Parquet)": self.cleaned_census_parquet,
+            "Authority Mapping (Parquet)": self.authority_mapping_parquet,
+            "Enriched Wildfire (Parquet)": self.enriched_wildfire_parquet,
             "Authority Mapping": self.authority_mapping,
             "Unmatched Authorities": self.unmatched_authorities,
             "Low Confidence Matches": self.low_confidence_matches,
@@ -220,9 +281,63 @@ class IOPaths:
         print(f"  - Raw Text: {self.raw_text_dir}")
         print(f"  - QA Reports: {self.qa_dir}")
         print(f"  - Archive: {self.archive_dir}")
+        print(f"  - Cache: {self.cache_dir}")
         print("="*60 + "\n")
 
 
+def _parquet_copy(csv_path: str) -> str:
+    """Path of the Parquet copy written alongside a CSV table."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def intermediate_exists(csv_path: str) -> bool:
+    """
+    Check whether a pipeline table can be read by read_intermediate.
+    
+    With CSV dual-writing off only the Parquet copy is written, so either
+    file counts.
+    
+    Args:
+        csv_path (str): Path to the CSV version of the table
+        
+    Returns:
+        bool: True if the CSV or its Parquet copy exists
+    """
+    return os.path.exists(csv_path) or os.path.exists(_parquet_copy(csv_path))
+
+
+def read_intermediate(csv_path: str) -> pd.DataFrame:
+    """
+    Read a pipeline table, preferring its Parquet copy when it is current.
+    
+    Parquet keeps dtypes and is much faster to load than re-parsing CSV.
+    The CSV is the human-facing copy and may be hand-edited or replaced,
+    so the Parquet copy is only used when the CSV is missing or is not
+    newer than it.
+    
+    Args:
+        csv_path (str): Path to the CSV version of the table
+        
+    Returns:
+        pd.DataFrame: Loaded table
+    
+    Raises:
+        FileNotFoundError: If neither the CSV nor its Parquet copy exists
+    """
+    parquet_path = _parquet_copy(csv_path)
+    if os.path.exists(parquet_path):
+        if not os.path.exists(csv_path):
+            print(f"  → Reading {parquet_path} (no CSV copy)")
+            return pd.read_parquet(parquet_path)
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+            print(f"  → Reading {parquet_path}")
+            return pd.read_parquet(parquet_path)
+        print(f"  ⚠️ {csv_path} is newer than its Parquet copy, reading CSV")
+    else:
+        print(f"  → Reading {csv_path}")
+    return pd.read_csv(csv_path)
+
+
 if __name__ == "__main__":
     # Test the IO paths configuration
     paths = IOPaths()
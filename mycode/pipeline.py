@@ -11,28 +11,33 @@ USAGE:
     python pipeline.py                    # Run full pipeline
     python pipeline.py --cutoff 85        # Run with custom match threshold
     python pipeline.py --skip-scraping    # Use existing scraped data
+    python pipeline.py --parquet-only     # Skip CSV copies of Parquet tables
 
 OUTPUTS:
-    - csv files/T1_Wildfire_Evacs_Enriched.csv (latest)
+    - csv files/T1_Wildfire_Evacs_Enriched.csv (latest; .parquet with --parquet-only)
     - csv files/T1_Wildfire_Evacs_Enriched_YYYYMMDD_HHMMSS.csv (versioned)
     - qa_reports/QA_Pipeline_YYYYMMDD_HHMMSS.txt (quality report)
     - csv files/unmatched_authorities.csv (requires manual review)
 """
 
 import argparse
+import os
 import sys
 import pandas as pd
 from datetime import datetime, UTC
 
 # ETL Modules - organized by pipeline stage
-from pipeline.extract.t1_manitoba import scrape_wildfire_data, T1_URLS, QASignals
-from pipeline.transform.cleaning import clean_wildfire_data, clean_census_data
+from pipeline.extract.t1_manitoba import fetch_pages, scrape_wildfire_data, T1_URLS, QASignals
+from pipeline.transform.cleaning import clean_wildfire_data, clean_census_data, build_census_lookup
 from pipeline.transform.matching import create_matching_pipeline, MatchReport
-from io_paths import IOPaths
+from io_paths import IOPaths, intermediate_exists, read_intermediate
 from pipeline.load.export import ExportManager
 from statscan_api import fetch_manitoba_census_2021
 from pipeline.transform.matching import create_matching_pipeline_with_designated_places
 
+# Stage/summary separator line
+_BANNER = "=" * 60
+
 # In transform_enrich method (around line 150), replace with:
 def transform_enrich(
     self, 
@@ -71,33 +76,34 @@ def transform_enrich(
 class PipelineOrchestrator:
     """Orchestrate the complete ETL pipeline with QA tracking."""
     
-    def __init__(self, match_cutoff: int = 80, skip_scraping: bool = False):
+    def __init__(self, match_cutoff: int = 80, skip_scraping: bool = False, dual_write_csv: bool = True):
         """
         Initialize pipeline orchestrator.
         
         Args:
             match_cutoff (int): Minimum fuzzy match score (0-100)
             skip_scraping (bool): If True, use existing scraped data
+            dual_write_csv (bool): Also write CSV versions of Parquet tables
         """
         self.match_cutoff = match_cutoff
         self.skip_scraping = skip_scraping
         
         # Initialize paths and managers
         self.paths = IOPaths()
-        self.export_manager = ExportManager(self.paths)
+        self.export_manager = ExportManager(self.paths, dual_write_csv=dual_write_csv)
         
         # QA tracking
         self.scraping_qa = QASignals()
         self.match_report = None
+        self.match_rate = None
+        self.enrichment_rate = None
         
         # Pipeline start time
         self.start_time = datetime.now(UTC)
     
     def print_header(self, stage: str):
         """Print stage header."""
-        print("\n" + "="*60)
-        print(f"STAGE: {stage}")
-        print("="*60)
+        print(f"\n{_BANNER}\nSTAGE: {stage}\n{_BANNER}")
     
     def extract(self) -> pd.DataFrame:
         """
@@ -110,18 +116,19 @@ class PipelineOrchestrator:
         
         if self.skip_scraping:
             print("\n⚠️ Skipping scraping - loading existing data...")
-            if not pd.io.common.file_exists(self.paths.wildfire_input):
+            if not intermediate_exists(self.paths.wildfire_input):
                 print(f"❌ ERROR: File not found: {self.paths.wildfire_input}")
                 print("Please run without --skip-scraping to scrape fresh data.")
                 sys.exit(1)
             
-            wildfire_df = pd.read_csv(self.paths.wildfire_input)
-            print(f"✓ Loaded {len(wildfire_df)} records from {self.paths.wildfire_input}")
+            wildfire_df = read_intermediate(self.paths.wildfire_input)
+            print(f"✓ Loaded {len(wildfire_df)} existing records")
             return wildfire_df
         
         # Scrape fresh data
         print(f"\nScraping {len(T1_URLS)} source(s)...")
-        wildfire_df = scrape_wildfire_data(T1_URLS, self.scraping_qa)
+        pages = fetch_pages(T1_URLS)
+        wildfire_df = scrape_wildfire_data(pages, self.scraping_qa)
         
         if wildfire_df.empty:
             print("\n❌ ERROR: No data scraped. Check:")
@@ -148,18 +155,23 @@ class PipelineOrchestrator:
         print("\n[1/2] Cleaning wildfire evacuation data...")
         wildfire_clean = clean_wildfire_data(wildfire_df)
         
-        # Clean census data - FETCH FROM API
-        print("\n[2/2] Fetching census data from Statistics Canada API...")
-        from statscan_api import fetch_manitoba_census_2021, CensusQASignals
-        
-        census_qa = CensusQASignals()
-        census_raw = fetch_manitoba_census_2021(census_qa)
-        
-        # Log QA signals
-        for key, value in census_qa.signals.items():
-            print(f"  {key}: {value}")
-        
-        census_clean = clean_census_data(census_raw)
+        # Clean census data - a local census profile CSV takes precedence
+        # (its cleaned lookup is cached per file content), else FETCH FROM API
+        if os.path.exists(self.paths.census_input):
+            print(f"\n[2/2] Loading census lookup from {self.paths.census_input}...")
+            census_clean = build_census_lookup(self.paths.census_input)
+        else:
+            print("\n[2/2] Fetching census data from Statistics Canada API...")
+            from statscan_api import fetch_manitoba_census_2021, CensusQASignals
+            
+            census_qa = CensusQASignals()
+            census_raw = fetch_manitoba_census_2021(census_qa)
+            
+            # Log QA signals
+            for key, value in census_qa.signals.items():
+                print(f"  {key}: {value}")
+            
+            census_clean = clean_census_data(census_raw)
         
         # Export cleaned datasets
         self.export_manager.export_cleaned_wildfire(wildfire_clean)
@@ -192,15 +204,16 @@ class PipelineOrchestrator:
             wildfire_clean,
             census_clean,
             score_cutoff=self.match_cutoff,
-            output_dir=self.paths.csv_dir
+            output_dir=self.paths.csv_dir,
+            dual_write_csv=self.export_manager.dual_write_csv
         )
         
-        # Store match report for later
+        # Store match report and its rates for later stages
         self.match_report = match_report
+        self.match_rate = match_rate = match_report.get_match_rate()
+        self.enrichment_rate = enrichment_rate = match_report.get_enrichment_rate()
         
         # Check match quality
-        match_rate = match_report.get_match_rate()
-        enrichment_rate = match_report.get_enrichment_rate()
         
         if match_rate < 70:
             print(f"\n⚠️ WARNING: Low match rate ({match_rate:.1f}%)")
@@ -254,9 +267,9 @@ class PipelineOrchestrator:
         end_time = datetime.now(UTC)
         duration = (end_time - self.start_time).total_seconds()
         
-        summary = ["="*60]
+        summary = [_BANNER]
         summary.append("WILDFIRE EVACUATION PIPELINE - SUMMARY REPORT")
-        summary.append("="*60)
+        summary.append(_BANNER)
         summary.append(f"Run Timestamp: {self.paths.run_timestamp}")
         summary.append(f"Duration: {duration:.2f} seconds")
         summary.append(f"Match Cutoff: {self.match_cutoff}")
@@ -273,14 +286,14 @@ class PipelineOrchestrator:
         summary.append(f"  Forward-filled authorities: {self.scraping_qa.signals.get('forward_filled_authorities', 0)}")
         
         if self.match_report:
-            summary.append(f"  Match rate: {self.match_report.get_match_rate():.1f}%")
-            summary.append(f"  Enrichment rate: {self.match_report.get_enrichment_rate():.1f}%")
+            summary.append(f"  Match rate: {self.match_rate:.1f}%")
+            summary.append(f"  Enrichment rate: {self.enrichment_rate:.1f}%")
         
         # Load stage summary
         summary.append("\n[LOAD STAGE]")
         summary.append(f"  Final enriched records: {len(enriched_df)}")
         
-        enriched_count = enriched_df['DGUID'].notna().sum()
+        enriched_count = enriched_df['DGUID'].count()
         summary.append(f"  Records with census data: {enriched_count}")
         
         if 'Census_Pop_2021' in enriched_df.columns:
@@ -304,22 +317,22 @@ class PipelineOrchestrator:
         
         # Output files
         summary.append("\n[KEY OUTPUT FILES]")
-        summary.append(f"  Main Output: {self.paths.enriched_wildfire_latest}")
-        summary.append(f"  Versioned: {self.paths.enriched_wildfire_versioned}")
+        for label, path in self.export_manager.main_output_paths().items():
+            summary.append(f"  {label}: {path}")
         summary.append(f"  QA Report: {self.paths.qa_report_pipeline}")
         
-        summary.append("\n" + "="*60)
+        summary.append("\n" + _BANNER)
         summary.append("PIPELINE COMPLETE")
-        summary.append("="*60)
+        summary.append(_BANNER)
         
         return "\n".join(summary)
     
     def run(self):
         """Execute the complete ETL pipeline."""
-        print("\n" + "="*60)
+        print("\n" + _BANNER)
         print("WILDFIRE EVACUATION DATA PIPELINE")
         print("Manitoba Tier 1 Government Sources")
-        print("="*60)
+        print(_BANNER)
         print(f"Run Timestamp: {self.paths.run_timestamp}")
         print(f"Match Cutoff: {self.match_cutoff}")
         print(f"Skip Scraping: {self.skip_scraping}")
@@ -338,19 +351,17 @@ class PipelineOrchestrator:
             self.load(wildfire_enriched)
             
             # Final summary
-            print("\n" + "="*60)
+            print("\n" + _BANNER)
             print("✓ PIPELINE COMPLETED SUCCESSFULLY")
-            print("="*60)
+            print(_BANNER)
             print(f"\nMain output file:")
-            print(f"  → {self.paths.enriched_wildfire_latest}")
+            print(f"  → {self.export_manager.main_output_paths()['Main Output']}")
             print(f"\nFor detailed results, see:")
             print(f"  → {self.paths.qa_report_pipeline}")
             
             # Display match quality if concerning
-            if self.match_report:
-                match_rate = self.match_report.get_match_rate()
-                if match_rate < 80:
-                    print(f"\n⚠️ Match rate is {match_rate:.1f}% - review unmatched authorities")
+            if self.match_report and self.match_rate < 80:
+                print(f"\n⚠️ Match rate is {self.match_rate:.1f}% - review unmatched authorities")
             
             print("\n")
             
@@ -377,9 +388,10 @@ Examples:
   python pipeline.py                    # Run full pipeline
   python pipeline.py --cutoff 85        # Use 85% match threshold
   python pipeline.py --skip-scraping    # Use existing scraped data
+  python pipeline.py --parquet-only     # Skip CSV copies of Parquet tables
   
 Output Files:
-  - csv files/T1_Wildfire_Evacs_Enriched.csv (main output)
+  - csv files/T1_Wildfire_Evacs_Enriched.csv (main output; .parquet with --parquet-only)
   - qa_reports/QA_Pipeline_YYYYMMDD_HHMMSS.txt (quality report)
   - csv files/unmatched_authorities.csv (requires review)
         """
@@ -396,7 +408,13 @@ Output Files:
     parser.add_argument(
         "--skip-scraping",
         action="store_true",
-        help="Skip scraping and use existing T1_Wildfire_Evacs.csv"
+        help="Skip scraping and use existing T1_Wildfire_Evacs.csv (or .parquet)"
+    )
+    
+    parser.add_argument(
+        "--parquet-only",
+        action="store_true",
+        help="Write tables as Parquet only, without their CSV copies"
     )
     
     args = parser.parse_args()
@@ -409,7 +427,8 @@ Output Files:
     # Run pipeline
     pipeline = PipelineOrchestrator(
         match_cutoff=args.cutoff,
-        skip_scraping=args.skip_scraping
+        skip_scraping=args.skip_scraping,
+        dual_write_csv=not args.parquet_only
     )
     pipeline.run()
 
@@ -3,26 +3,51 @@ GNBC (GEOGRAPHICAL NAMES BOARD OF CANADA) DATA FETCHER
 Fetches official place names from Natural Resources Canada's database.
 """
 
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 from typing import Optional, List
 import time
+from io_paths import IOPaths
 
 
+_PREFIX_PATTERN = (
+    r"^(?:town of |city of |rm of |r\.m\. of |rural municipality of |"
+    r"municipality of |village of |northern village of |provincial park)"
+)
+_PREFIX_RE = re.compile(_PREFIX_PATTERN)
+
+
+@lru_cache(maxsize=4096)
 def normalize_name(name: str) -> str:
     """Normalize place names for matching."""
     if not isinstance(name, str):
         return ""
-    name = name.lower().strip()
-    prefixes = ["town of ", "city of ", "rm of ", "r.m. of ", "rural municipality of ", 
-                "municipality of ", "village of ", "northern village of ", "provincial park"]
-    for prefix in prefixes:
-        if name.startswith(prefix):
-            name = name[len(prefix):]
-            break
+    name = _PREFIX_RE.sub("", name.lower().strip(), count=1)
     return " ".join(name.split())
 
 
+def normalize_series(names: pd.Series) -> pd.Series:
+    """Apply normalize_name to a whole Series using vectorized string methods."""
+    return (
+        names.astype("str")
+        .str.lower()
+        .str.strip()
+        .str.replace(_PREFIX_PATTERN, "", n=1, regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .fillna("")
+    )
+
+
 class GNBCQASignals:
     """Track QA signals for GNBC data fetching."""
     
@@ -41,9 +66,10 @@ class GNBCQASignals:
 
 def fetch_gnbc_manitoba(
     entity_types: Optional[List[str]] = None,
-    qa_signals: Optional[GNBCQASignals] = None
+    qa_signals: Optional[GNBCQASignals] = None,
+    force_refresh: bool = False
 ) -> pd.DataFrame:
-    """Fetch Manitoba place names from GNBC database."""
+    """Fetch Manitoba place names from GNBC database (cached on disk, see fetch_via_api)."""
     
     if qa_signals is None:
         qa_signals = GNBCQASignals()
@@ -56,7 +82,7 @@ def fetch_gnbc_manitoba(
     qa_signals.add('entity_types_requested', ', '.join(entity_types))
     
     try:
-        gnbc_df = fetch_via_api(entity_types, qa_signals)
+        gnbc_df = fetch_via_api(entity_types, qa_signals, force_refresh)
         qa_signals.add('fetch_method', 'API - GNBC Web Service')
         return gnbc_df
     except Exception as e:
@@ -65,39 +91,109 @@ def fetch_gnbc_manitoba(
         return fetch_via_fallback(qa_signals)
 
 
-def fetch_via_api(entity_types: List[str], qa_signals: GNBCQASignals) -> pd.DataFrame:
-    """Fetch from GNBC web service API."""
+GNBC_API_URL = "https://geogratis.gc.ca/services/geoname/en/geonames"
+
+# Concurrent GNBC requests per fetch (one per entity type, capped)
+MAX_CONCURRENT_REQUESTS = 5
+
+# Shared HTTP session - the concurrent entity-type requests all go to the same
+# host, so pooled keep-alive connections skip a TCP+TLS handshake per request.
+# Politeness comes from the bounded worker pool plus backoff when the server
+# pushes back or fails transiently (honouring Retry-After), not a fixed sleep.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+    respect_retry_after_header=True
+)
+SESSION = requests.Session()
+SESSION.headers["Accept"] = "application/json"  # gzip is negotiated by default
+_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=_RETRY)
+SESSION.mount("https://", _adapter)
+
+# Place names change rarely; reuse a complete API response for a week
+GNBC_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def _gnbc_cache_path(entity_types: List[str], province: str = "MB") -> str:
+    """Cache file for a (province, entity types) GNBC request."""
+    key = hashlib.sha1(f"{province}|{sorted(entity_types)}".encode()).hexdigest()[:16]
+    return IOPaths().gnbc_cache(key)
+
+
+def _load_cached_places(cache_path: str) -> Optional[List[dict]]:
+    """Return cached GNBC items if present and fresh, else None."""
+    try:
+        if time.time() - os.path.getmtime(cache_path) > GNBC_CACHE_TTL_SECONDS:
+            return None
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _fetch_entity_type(entity_type: str) -> List[dict]:
+    """Fetch one entity type from the GNBC web service (raises on failure)."""
+    params = {
+        'q': '*',
+        'province': 'MB',
+        'theme': entity_type,
+        'concise': 'province',
+        'num': 1000,
+        'output': 'summary'
+    }
+    
+    response = SESSION.get(GNBC_API_URL, params=params, timeout=30)
+    response.raise_for_status()
+    data = response.json()
+    
+    places = data.get('items', [])
+    if 'items' in data:
+        print(f"    ✓ Found {len(places)} {entity_type} entries")
     
-    base_url = "https://geogratis.gc.ca/services/geoname/en/geonames"
-    all_places = []
+    return places
+
+
+def fetch_via_api(
+    entity_types: List[str],
+    qa_signals: GNBCQASignals,
+    force_refresh: bool = False
+) -> pd.DataFrame:
+    """
+    Fetch from GNBC web service API, one concurrent request per entity type.
     
-    for entity_type in entity_types:
-        print(f"  → Fetching {entity_type} from GNBC...")
+    Transient HTTP errors are retried by the session adapter; any request
+    that still fails raises, so fetch_gnbc_manitoba falls back to the
+    embedded data instead of using a partial response. Responses are
+    cached on disk for GNBC_CACHE_TTL_SECONDS and reused by later runs
+    unless force_refresh.
+    """
+    cache_path = _gnbc_cache_path(entity_types)
+    all_places = None if force_refresh else _load_cached_places(cache_path)
+    
+    if all_places is not None:
+        print(f"  → Using cached GNBC places: {cache_path}")
+        qa_signals.add('api_cache_hit', True)
+    else:
+        for entity_type in entity_types:
+            print(f"  → Fetching {entity_type} from GNBC...")
+        
+        # Requests are I/O bound: run them side by side, keeping entity-type order
+        max_workers = max(1, min(MAX_CONCURRENT_REQUESTS, len(entity_types)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_fetch_entity_type, entity_types))
         
-        params = {
-            'q': '*',
-            'province': 'MB',
-            'theme': entity_type,
-            'concise': 'province',
-            'num': 1000,
-            'output': 'summary'
-        }
+        all_places = [place for places in results for place in places]
         
-        try:
-            response = requests.get(base_url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'items' in data:
-                places = data['items']
-                all_places.extend(places)
-                print(f"    ✓ Found {len(places)} {entity_type} entries")
-            
-            time.sleep(0.5)
-            
-        except Exception as e:
-            print(f"    ⚠️ Failed to fetch {entity_type}: {e}")
-            continue
+        if all_places:
+            # Best-effort: a failed cache write must not discard good API data
+            try:
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump(all_places, f)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"  ⚠️ Could not cache GNBC places ({e})")
+                qa_signals.add('api_cache_write_error', str(e))
     
     if not all_places:
         raise ValueError("No data retrieved from GNBC API")
@@ -109,120 +205,150 @@ def fetch_via_api(entity_types: List[str], qa_signals: GNBCQASignals) -> pd.Data
     return df
 
 
+# Low-cardinality label columns, stored as categoricals
+_CATEGORICAL_COLUMNS = ('entity_type', 'generic_category', 'province', 'data_source')
+
+
+def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Store label columns as categoricals and the zero-filled counts as int32."""
+    for col in _CATEGORICAL_COLUMNS:
+        # API payloads can carry nested objects; only plain labels are cast
+        if col in df.columns and pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+            df[col] = df[col].astype('category')
+    
+    df['population'] = df['population'].astype('int32')
+    df['indigenous_population'] = df['indigenous_population'].astype('int32')
+    return df
+
+
 def process_gnbc_data(df: pd.DataFrame, qa_signals: GNBCQASignals) -> pd.DataFrame:
     """Process and standardize GNBC data."""
     
+    # API field -> pipeline column (latitude/longitude/province keep their names)
     column_mapping = {
         'name': 'place_name',
         'generic': 'generic_category',
         'theme': 'entity_type',
-        'latitude': 'latitude',
-        'longitude': 'longitude',
-        'province': 'province',
         'location': 'location_description'
     }
+    df = df.rename(columns=column_mapping)
     
-    rename_dict = {k: v for k, v in column_mapping.items() if k in df.columns}
-    df = df.rename(columns=rename_dict)
+    if 'place_name' not in df.columns:
+        raise ValueError("GNBC response has no 'name' field")
     
-    if 'place_name' not in df.columns and 'name' in df.columns:
-        df['place_name'] = df['name']
-    
-    df['place_name_normalized'] = df['place_name'].apply(normalize_name)
+    df['place_name_normalized'] = normalize_series(df['place_name'])
     df['data_source'] = 'GNBC'
     df['is_designated_place'] = True
     df['population'] = 0
     df['indigenous_population'] = 0
     
-    def get_notes(row):
-        entity = row.get('entity_type', 'UNKNOWN')
-        generic = row.get('generic_category', '')
-        
-        if entity == 'LAKE':
-            return 'Natural water body - uninhabited'
-        elif entity == 'PARK':
-            return f'{generic} - uninhabited wilderness'
-        elif entity == 'POPULATED PLACE':
-            return 'Unincorporated community'
-        elif entity == 'RESERVE':
-            return 'First Nations reserve - see census for population'
-        else:
-            return f'Designated place - {generic}'
+    # Notes depend only on entity type (plus the generic category text)
+    entity = df['entity_type'] if 'entity_type' in df.columns else pd.Series('UNKNOWN', index=df.index)
+    generic = df['generic_category'] if 'generic_category' in df.columns else pd.Series('', index=df.index)
+    generic = generic.fillna('').astype(str).to_numpy(dtype=object)
     
-    df['notes'] = df.apply(get_notes, axis=1)
+    df['notes'] = np.select(
+        [
+            (entity == 'LAKE').to_numpy(dtype=bool),
+            (entity == 'PARK').to_numpy(dtype=bool),
+            (entity == 'POPULATED PLACE').to_numpy(dtype=bool),
+            (entity == 'RESERVE').to_numpy(dtype=bool),
+        ],
+        [
+            'Natural water body - uninhabited',
+            generic + ' - uninhabited wilderness',
+            'Unincorporated community',
+            'First Nations reserve - see census for population',
+        ],
+        default='Designated place - ' + generic
+    )
+    df = _compact_dtypes(df)
     qa_signals.add('places_processed', len(df))
     
     return df
 
 
-def fetch_via_fallback(qa_signals: GNBCQASignals) -> pd.DataFrame:
-    """Fallback: Embedded GNBC data for Manitoba designated places."""
-    
-    gnbc_places = [
+# Embedded GNBC data for Manitoba designated places, stored column-wise so the
+# fallback DataFrame is built one column at a time (entries line up by position)
+_FALLBACK_PLACES = {
+    'place_name': [
         # LAKES
-        {'place_name': 'Nopiming Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake', 
-         'latitude': 51.2, 'longitude': -95.1, 'notes': 'Within Nopiming Provincial Park'},
-        {'place_name': 'Island Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 53.85, 'longitude': -94.65, 'notes': 'Large lake - Island Lake region'},
-        {'place_name': 'Payuk Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 55.9, 'longitude': -97.8, 'notes': 'Remote northern lake'},
-        {'place_name': 'Schist Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 55.8, 'longitude': -97.9, 'notes': 'Remote northern lake'},
-        {'place_name': 'Twin Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 55.85, 'longitude': -97.85, 'notes': 'Remote northern lake'},
-        {'place_name': 'Burge Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 55.87, 'longitude': -97.82, 'notes': 'Remote northern lake'},
-        {'place_name': 'Zed Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 55.88, 'longitude': -97.88, 'notes': 'Remote northern lake'},
-        {'place_name': 'White Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 55.7, 'longitude': -98.1, 'notes': 'Northwest region lake'},
-        {'place_name': 'Whitefish Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 51.8, 'longitude': -100.5, 'notes': 'Lake near Camperville'},
-        {'place_name': 'Lake Athapapuskow', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 54.8, 'longitude': -101.7, 'notes': 'Large lake with cottages'},
-        {'place_name': 'Wallace Lake', 'entity_type': 'LAKE', 'generic_category': 'Lake',
-         'latitude': 54.75, 'longitude': -101.8, 'notes': 'Cottage area near Flin Flon'},
-        
+        'Nopiming Lake', 'Island Lake', 'Payuk Lake',
+        'Schist Lake', 'Twin Lake', 'Burge Lake',
+        'Zed Lake', 'White Lake', 'Whitefish Lake',
+        'Lake Athapapuskow', 'Wallace Lake',
         # PARKS
-        {'place_name': 'Nopiming Provincial Park', 'entity_type': 'PARK', 'generic_category': 'Provincial Park',
-         'latitude': 51.1, 'longitude': -95.2, 'notes': 'Wilderness provincial park - 1,430 sq km'},
-        {'place_name': 'Whiteshell Provincial Park', 'entity_type': 'PARK', 'generic_category': 'Provincial Park',
-         'latitude': 49.8, 'longitude': -95.2, 'notes': 'Provincial park - 2,729 sq km'},
-        {'place_name': 'Atikaki Provincial Park', 'entity_type': 'PARK', 'generic_category': 'Provincial Park',
-         'latitude': 52.5, 'longitude': -95.0, 'notes': 'Wilderness provincial park - 3,981 sq km'},
-        {'place_name': 'Atikaki Provincial Park (South Portion)', 'entity_type': 'PARK', 'generic_category': 'Provincial Park',
-         'latitude': 52.3, 'longitude': -95.0, 'notes': 'South portion of Atikaki Provincial Park'},
-        {'place_name': 'Wekusko Falls Provincial Park', 'entity_type': 'PARK', 'generic_category': 'Provincial Park',
-         'latitude': 54.8, 'longitude': -99.9, 'notes': 'Provincial park near Snow Lake'},
-        {'place_name': 'Grass River Provincial Park', 'entity_type': 'PARK', 'generic_category': 'Provincial Park',
-         'latitude': 54.7, 'longitude': -100.1, 'notes': 'Provincial park - 2,277 sq km'},
-        {'place_name': 'Bakers Narrows Provincial Park', 'entity_type': 'PARK', 'generic_category': 'Provincial Park',
-         'latitude': 54.72, 'longitude': -101.85, 'notes': 'Recreational park near Flin Flon'},
-        
+        'Nopiming Provincial Park', 'Whiteshell Provincial Park', 'Atikaki Provincial Park',
+        'Atikaki Provincial Park (South Portion)', 'Wekusko Falls Provincial Park', 'Grass River Provincial Park',
+        'Bakers Narrows Provincial Park',
         # POPULATED PLACES
-        {'place_name': 'Herb Lake Landing', 'entity_type': 'POPULATED PLACE', 'generic_category': 'Hamlet',
-         'latitude': 56.2, 'longitude': -98.4, 'notes': 'Unincorporated northern community'},
-        {'place_name': 'Kelsey', 'entity_type': 'POPULATED PLACE', 'generic_category': 'Locality',
-         'latitude': 56.05, 'longitude': -96.5, 'notes': 'Small northern locality'},
-        {'place_name': 'Granville Lake', 'entity_type': 'POPULATED PLACE', 'generic_category': 'Locality',
-         'latitude': 56.3, 'longitude': -100.7, 'notes': 'Remote northern community'},
-        {'place_name': 'Sherridon', 'entity_type': 'POPULATED PLACE', 'generic_category': 'Locality',
-         'latitude': 55.13, 'longitude': -101.08, 'notes': 'Former mining community'},
-        {'place_name': 'Community of Sherridon', 'entity_type': 'POPULATED PLACE', 'generic_category': 'Locality',
-         'latitude': 55.13, 'longitude': -101.08, 'notes': 'Former mining community'},
-        {'place_name': 'Cormorant', 'entity_type': 'POPULATED PLACE', 'generic_category': 'Hamlet',
-         'latitude': 53.38, 'longitude': -101.08, 'notes': 'Small hamlet'},
-        {'place_name': 'Bissett', 'entity_type': 'POPULATED PLACE', 'generic_category': 'Hamlet',
-         'latitude': 51.03, 'longitude': -95.67, 'notes': 'Mining community'},
-    ]
-    
-    df = pd.DataFrame(gnbc_places)
-    df['place_name_normalized'] = df['place_name'].apply(normalize_name)
+        'Herb Lake Landing', 'Kelsey', 'Granville Lake',
+        'Sherridon', 'Community of Sherridon', 'Cormorant',
+        'Bissett'
+    ],
+    'entity_type': ['LAKE'] * 11 + ['PARK'] * 7 + ['POPULATED PLACE'] * 7,
+    'generic_category': (
+        ['Lake'] * 11 + ['Provincial Park'] * 7
+        + ['Hamlet', 'Locality', 'Locality', 'Locality', 'Locality', 'Hamlet', 'Hamlet']
+    ),
+    'latitude': [
+        # LAKES
+        51.2, 53.85, 55.9, 55.8, 55.85, 55.87, 55.88, 55.7,
+        51.8, 54.8, 54.75,
+        # PARKS
+        51.1, 49.8, 52.5, 52.3, 54.8, 54.7, 54.72,
+        # POPULATED PLACES
+        56.2, 56.05, 56.3, 55.13, 55.13, 53.38, 51.03
+    ],
+    'longitude': [
+        # LAKES
+        -95.1, -94.65, -97.8, -97.9, -97.85, -97.82, -97.88, -98.1,
+        -100.5, -101.7, -101.8,
+        # PARKS
+        -95.2, -95.2, -95.0, -95.0, -99.9, -100.1, -101.85,
+        # POPULATED PLACES
+        -98.4, -96.5, -100.7, -101.08, -101.08, -101.08, -95.67
+    ],
+    'notes': [
+        # LAKES
+        'Within Nopiming Provincial Park', 'Large lake - Island Lake region',
+        'Remote northern lake', 'Remote northern lake',
+        'Remote northern lake', 'Remote northern lake',
+        'Remote northern lake', 'Northwest region lake',
+        'Lake near Camperville', 'Large lake with cottages',
+        'Cottage area near Flin Flon',
+        # PARKS
+        'Wilderness provincial park - 1,430 sq km', 'Provincial park - 2,729 sq km',
+        'Wilderness provincial park - 3,981 sq km', 'South portion of Atikaki Provincial Park',
+        'Provincial park near Snow Lake', 'Provincial park - 2,277 sq km',
+        'Recreational park near Flin Flon',
+        # POPULATED PLACES
+        'Unincorporated northern community', 'Small northern locality',
+        'Remote northern community', 'Former mining community',
+        'Former mining community', 'Small hamlet',
+        'Mining community'
+    ],
+}
+
+
+@lru_cache(maxsize=1)
+def _fallback_places_df() -> pd.DataFrame:
+    """Build the processed fallback DataFrame (once per process)."""
+    df = pd.DataFrame(_FALLBACK_PLACES)
+    df['place_name_normalized'] = normalize_series(df['place_name'])
     df['data_source'] = 'GNBC_FALLBACK'
     df['is_designated_place'] = True
     df['population'] = 0
     df['indigenous_population'] = 0
     df['province'] = 'MB'
+    return _compact_dtypes(df)
+
+
+def fetch_via_fallback(qa_signals: GNBCQASignals) -> pd.DataFrame:
+    """Fallback: Embedded GNBC data for Manitoba designated places."""
+    
+    # Shallow copy so callers adding columns don't alter the cached frame
+    df = _fallback_places_df().copy(deep=False)
     
     qa_signals.add('places_processed', len(df))
     qa_signals.add('fallback_dataset_used', True)
@@ -8,6 +8,7 @@ These are official places not in census subdivisions:
 - Unincorporated communities
 """
 
+import numpy as np
 import pandas as pd
 from typing import Optional
 from pipeline.extract.gnbc import fetch_gnbc_manitoba, GNBCQASignals
@@ -31,8 +32,7 @@ def load_designated_places() -> pd.DataFrame:
     )
     
     # Log QA signals
-    for key, value in qa_signals.signals.items():
-        print(f"    {key}: {value}")
+    print(qa_signals.report())
     
     return gnbc_df
 
@@ -56,17 +56,22 @@ def match_designated_places(
     if gnbc_df.empty:
         return pd.DataFrame(), unmatched_df
     
-    # Merge on normalized names
-    matched = unmatched_df.merge(
-        gnbc_df,
-        left_on=authority_col,
-        right_on='place_name_normalized',
-        how='inner'
+    # Hash lookup of normalized names into GNBC rows (first entry per name, so
+    # a duplicated GNBC name can't multiply wildfire records)
+    gnbc_lookup = gnbc_df.drop_duplicates('place_name_normalized')
+    positions = pd.Index(gnbc_lookup['place_name_normalized']).get_indexer(
+        unmatched_df[authority_col]
     )
+    hit = positions >= 0
     
-    if matched.empty:
+    if not hit.any():
         return pd.DataFrame(), unmatched_df
     
+    matched = unmatched_df[hit].reset_index(drop=True).join(
+        gnbc_lookup.iloc[positions[hit]].reset_index(drop=True),
+        rsuffix='_gnbc'
+    )
+    
     # Rename/add columns to match census format
     matched = matched.rename(columns={
         'place_name': 'MATCHED_NAME',
@@ -75,7 +80,9 @@ def match_designated_places(
     })
     
     # Add census-compatible fields
-    matched['DGUID'] = 'GNBC_' + matched['entity_type'].str.upper() + '_' + matched.index.astype(str)
+    entity_codes = matched['entity_type'].astype('str').str.upper()
+    row_ids = pd.Series(np.arange(len(matched)), index=matched.index).astype('str')
+    matched['DGUID'] = 'GNBC_' + entity_codes + '_' + row_ids
     matched['ALT_GEO_CODE'] = 'DESIGNATED_PLACE'
     matched['GEO_NAME'] = matched['MATCHED_NAME']
     matched['INDIG_DENOM_2021'] = 0
@@ -84,13 +91,13 @@ def match_designated_places(
     matched['match_score'] = 100
     
     # Find still unmatched
-    matched_authorities = matched[authority_col].unique()
-    still_unmatched = unmatched_df[~unmatched_df[authority_col].isin(matched_authorities)]
+    still_unmatched = unmatched_df[~hit]
     
     print(f"  ✓ Matched {len(matched)} records to GNBC designated places")
     if len(matched) > 0:
         print(f"    Breakdown:")
-        for entity_type, count in matched['entity_type'].value_counts().items():
+        type_counts = matched['entity_type'].value_counts()
+        for entity_type, count in type_counts[type_counts > 0].items():
             print(f"      - {entity_type}: {count}")
     print(f"  → {len(still_unmatched)} records remain unmatched")
     
@@ -117,12 +124,12 @@ def enrich_with_designated_places(
     Returns:
         Combined enriched dataset
     """
-    # Find unmatched records
+    # Find unmatched records (read-only below, so no defensive copies)
     if 'DGUID' in census_matches.columns:
         matched_ids = census_matches['event_id'].unique()
-        unmatched = wildfire_df[~wildfire_df['event_id'].isin(matched_ids)].copy()
+        unmatched = wildfire_df[~wildfire_df['event_id'].isin(matched_ids)]
     else:
-        unmatched = wildfire_df.copy()
+        unmatched = wildfire_df
     
     if unmatched.empty:
         print("\n[GNBC DESIGNATED PLACES]")
@@ -28,12 +28,20 @@ GIS CONSIDERATIONS:
 """
 
 # Import Python libraries
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
-from typing import Dict, Any, Tuple, List
-from bs4 import BeautifulSoup
+from typing import Dict, Any, Tuple, List, Optional
+from io import StringIO
+from lxml import html as lxml_html
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import json
 import os
+import shutil
+import threading
 from io_paths import IOPaths
 
 
@@ -46,6 +54,27 @@ T1_URLS: Dict[str, str] = {
     "Manitoba Evacs": "https://www.manitoba.ca/wildfire/evacuations.html"
 }
 
+# Shared HTTP session - keeps connections alive so repeated requests to the
+# same host reuse one TCP+TLS connection instead of a new handshake each time,
+# and retries transient server errors with backoff before a source is skipped
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+    respect_retry_after_header=True
+)
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=_RETRY)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# Concurrent page downloads per fetch_pages call (one per source, capped)
+MAX_CONCURRENT_FETCHES = 4
+
+# Serializes read-modify-write of the conditional-GET cache across fetch threads
+_HTTP_CACHE_LOCK = threading.Lock()
+
 # Define non-geographic labels that appear as section headers
 NON_GEOGRAPHIC_LABELS = {
     "evacuation lifted", "reopened", "closed", 
@@ -55,6 +84,14 @@ NON_GEOGRAPHIC_LABELS = {
 # Required table headers for validation
 REQUIRED_HEADERS = ["Local Authority", "Date Evacuation Initiated"]
 
+# Text-bearing blocks captured in the raw text dump, and elements whose
+# contents are not visible page text
+TEXT_BLOCKS_XPATH = "//p|//li|//div"
+NON_TEXT_XPATH = "//script|//style|//template"
+
+# Rows of a table, excluding rows of tables nested inside it
+TABLE_ROWS_XPATH = "./tr|./thead/tr|./tbody/tr|./tfoot/tr"
+
 
 # QA SIGNAL TRACKING
 class QASignals:
@@ -132,8 +169,8 @@ def ensure_directories():
     os.makedirs("qa_reports", exist_ok=True)
     from io_paths import IOPaths
     paths = IOPaths()
-    paths.raw_html_dir.mkdir(parents=True, exist_ok=True)
-    paths.raw_text_dir.mkdir(parents=True, exist_ok=True)
+    os.makedirs(paths.raw_html_dir, exist_ok=True)
+    os.makedirs(paths.raw_text_dir, exist_ok=True)
 
 
 def audit_local_authorities(df: pd.DataFrame, qa: QASignals) -> pd.Series:
@@ -178,16 +215,157 @@ def audit_local_authorities(df: pd.DataFrame, qa: QASignals) -> pd.Series:
     return unique_authorities
 
 
+# HTTP FETCHING
+def _load_http_cache() -> Dict[str, Dict[str, Any]]:
+    """Load the on-disk conditional-GET cache (empty if missing or unreadable)."""
+    try:
+        with open(paths.http_cache, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_http_cache(cache: Dict[str, Dict[str, Any]]):
+    """
+    Persist the conditional-GET cache to disk.
+    
+    Best-effort: the page was already downloaded, so a failed write only
+    costs a full download next run and must not fail the fetch.
+    """
+    try:
+        with open(paths.http_cache, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"  ⚠️ Could not save HTTP cache ({e})")
+
+
+def fetch_page(url: str, session: Optional[requests.Session] = None) -> str:
+    """
+    Fetch a page body, revalidating against the on-disk HTTP cache.
+    
+    Sends If-None-Match / If-Modified-Since from the previous response so
+    an unchanged page comes back as a bodyless HTTP 304 and the cached
+    body is reused instead of downloading it again.
+    
+    Args:
+        url (str): Page URL
+        session (requests.Session, optional): HTTP session to fetch with.
+            Defaults to the shared module-level SESSION.
+    
+    Returns:
+        str: Page HTML
+    
+    Raises:
+        requests.RequestException: If the request fails
+    """
+    session = session or SESSION
+    with _HTTP_CACHE_LOCK:
+        entry = _load_http_cache().get(url)
+    
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    
+    response = session.get(url, headers=headers, timeout=10)
+    
+    if response.status_code == 304 and entry:
+        print("  → Page unchanged since last run (HTTP 304), using cached copy")
+        return entry["body"]
+    
+    response.raise_for_status()
+    
+    # response.text re-decodes the body on every access; decode it once
+    html = response.text
+    
+    # Only cache responses the server lets us revalidate
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        # Re-read under the lock so concurrent fetches don't drop each other's entries
+        with _HTTP_CACHE_LOCK:
+            cache = _load_http_cache()
+            cache[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body": html,
+            }
+            _save_http_cache(cache)
+    
+    return html
+
+
 # SCRAPING FUNCTIONS
-def scrape_tier1_sources(urls: Dict[str, str]) -> Tuple[pd.DataFrame, str]:
+# Downloaded page for one source: (url, raw HTML)
+FetchedPage = Tuple[str, str]
+
+
+def fetch_pages(
+    urls: Dict[str, str],
+    session: Optional[requests.Session] = None
+) -> Dict[str, FetchedPage]:
     """
-    Fetch basic metadata from T1 sources and saves ALL raw HTML and text.
+    Download each T1 source exactly once.
+    
+    The metadata/text pass and the table extraction pass both consume the
+    result, so each page costs one HTTP fetch. Sources are downloaded
+    concurrently (up to MAX_CONCURRENT_FETCHES) and returned in input order.
     
     Args:
         urls (Dict[str, str]): Mapping of source names to URLs.
+        session (requests.Session, optional): HTTP session to fetch with.
+            Defaults to the shared module-level SESSION.
+    
+    Returns:
+        Dict[str, FetchedPage]: Mapping of source name to (url, html).
+            Sources that fail to download are omitted.
+    """
+    session = session or SESSION
+    pages: Dict[str, FetchedPage] = {}
+    
+    def fetch(url: str) -> Tuple[Optional[str], Optional[requests.RequestException]]:
+        try:
+            return fetch_page(url, session), None
+        except requests.RequestException as e:
+            return None, e
+    
+    for name, url in urls.items():
+        print(f"Fetching {name} from {url}...")
+    
+    # Downloads are I/O bound: run them side by side, keeping source order
+    max_workers = max(1, min(MAX_CONCURRENT_FETCHES, len(urls)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(fetch, urls.values()))
+    
+    for (name, url), (html, error) in zip(urls.items(), results):
+        if error is not None:
+            print(f"  ✗ Failed to fetch {name}: {error}")
+            continue
+        
+        pages[name] = (url, html)
+    
+    return pages
+
+
+def scrape_tier1_sources(
+    pages: Dict[str, FetchedPage],
+    raw_text_path: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Extract basic metadata from T1 sources and saves ALL raw HTML and text.
+    
+    Processed text is streamed to raw_text_path one source at a time, so
+    only the current page's text is held in memory.
+    
+    Args:
+        pages (Dict[str, FetchedPage]): Downloaded pages from fetch_pages.
+        raw_text_path (str, optional): File to write processed text to.
+            Text is not saved when omitted.
     
     Returns:
-        Tuple[pd.DataFrame, str]: DataFrame of metadata and raw text string.
+        pd.DataFrame: DataFrame of metadata.
     
     This creates a DataFrame with columns:
         - source_url
@@ -200,171 +378,167 @@ def scrape_tier1_sources(urls: Dict[str, str]) -> Tuple[pd.DataFrame, str]:
     paths = IOPaths()
     
     rows: List[Dict[str, Any]] = []
-    all_raw_text: List[str] = []
     
-    timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    # One timestamp per scrape: file names and provenance share it
+    scraped_at = datetime.now(UTC)
+    timestamp = scraped_at.strftime("%Y%m%d_%H%M%S")
+    source_timestamp = scraped_at.isoformat()
     
-    for name, url in urls.items():
-        try:
-            print(f"Fetching {name} from {url}...")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
+    text_file = open(raw_text_path, "w", encoding="utf-8") if raw_text_path else None
+    
+    try:
+        for name, (url, html) in pages.items():
             # Save raw HTML (actual page source)
-            html_filename = paths.raw_html_dir / f"{name.replace(' ', '_')}_{timestamp}.html"
+            html_filename = os.path.join(paths.raw_html_dir, f"{name.replace(' ', '_')}_{timestamp}.html")
             with open(html_filename, "w", encoding="utf-8") as f:
-                f.write(response.text)
+                f.write(html)
             print(f"  → Saved raw HTML to {html_filename}")
-            
-            # Parse HTML content
-            soup = BeautifulSoup(response.text, "html.parser")
 
-            # Extract all text within <p>, <li>, and <div> tags
-            paragraphs = soup.find_all(["p", "li", "div"])
-            text_blocks = [
-                p.get_text(strip=True)
-                for p in paragraphs
-                if p.get_text(strip=True)
-            ]
-            full_text = "\n".join(text_blocks)
-
-            # Store processed text for this source
-            all_raw_text.append(f"===== {name} | {url} =====\n{full_text}\n")
+            # Extract all text within <p>, <li>, and <div> tags in one lxml pass
+            doc = lxml_html.document_fromstring(html)
+            for element in doc.xpath(NON_TEXT_XPATH):
+                element.drop_tree()
+            text_blocks = (
+                "".join(t.strip() for t in block.itertext())
+                for block in doc.xpath(TEXT_BLOCKS_XPATH)
+            )
+            full_text = "\n".join(t for t in text_blocks if t)
+
+            # Write processed text for this source (blank line between sources)
+            if text_file:
+                if rows:
+                    text_file.write("\n")
+                text_file.write(f"===== {name} | {url} =====\n{full_text}\n")
 
             # Create metadata row
             rows.append({
                 "source_url": url,
                 "source_name": name,
                 "source_tier": 1,
-                "source_timestamp": datetime.now(UTC).isoformat(),
+                "source_timestamp": source_timestamp,
             })
 
             print(f"  ✓ Scraped {name} successfully.")
-            
-        except requests.RequestException as e:
-            print(f"  ✗ Failed to scrape {name}: {e}")
+    finally:
+        if text_file:
+            text_file.close()
     
     metadata_df = pd.DataFrame(rows)
-    raw_text_combined = "\n".join(all_raw_text)
     
-    return metadata_df, raw_text_combined
+    return metadata_df
+
+
+def _drop_section_header_rows(html: str) -> Tuple[str, int]:
+    """
+    Remove table rows that carry no <td> cells (region/section headings).
+    
+    read_html keeps these rows and copies a colspan <th> into every column,
+    so a heading like "Northern Region" would otherwise come back as a data
+    row naming a fake authority. The first row of each table is its header
+    and is always kept.
+    
+    Args:
+        html (str): Page HTML
+    
+    Returns:
+        Tuple[str, int]: HTML without section header rows, and the number
+            of rows removed. The input is returned unchanged when no rows
+            are removed.
+    """
+    doc = lxml_html.document_fromstring(html)
+    section_rows = [
+        row
+        for table in doc.iter("table")
+        for row in table.xpath(TABLE_ROWS_XPATH)[1:]
+        if not row.xpath("./td")
+    ]
+    if not section_rows:
+        return html, 0
+    
+    for row in section_rows:
+        row.drop_tree()
+    return lxml_html.tostring(doc, encoding="unicode"), len(section_rows)
 
 
-def scrape_wildfire_data(urls: Dict[str, str], qa: QASignals) -> pd.DataFrame:
+def scrape_wildfire_data(pages: Dict[str, FetchedPage], qa: QASignals) -> pd.DataFrame:
     """
     Extract structured wildfire evacuation data from T1 sources.
     
     Focus on tables with specific headers "Local Authority",
     "Date Evacuation Initiated".
     
-    Handle rowspan and colspan in HTML tables (merged cells).
+    Tables are read with pandas.read_html (lxml flavor), which expands
+    rowspan and colspan (merged cells) natively. Rows without any <td>
+    (section headings) are removed first, matching the old row walker.
+    
+    Args:
+        pages (Dict[str, FetchedPage]): Downloaded pages from fetch_pages.
+        qa (QASignals): QA signals tracker
     
     Returns:
         pd.DataFrame: DataFrame with structured wildfire evacuation data.
     """
     
-    from io_paths import IOPaths
-    paths = IOPaths()
-    
-    records: List[Dict[str, Any]] = []
+    frames: List[pd.DataFrame] = []
+    scraped_at = datetime.now(UTC).isoformat()
     tables_found = 0
     tables_matched = 0
 
-    for name, url in urls.items():
-        try:
-            print(f"\nExtracting structured data from {name}...")
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
+    for name, (url, html) in pages.items():
+        print(f"\nExtracting structured data from {name}...")
 
-            tables = soup.find_all("table")
-            tables_found += len(tables)
-            
-            if not tables:
-                print(f"  ⚠️ No tables found on page")
-                continue
+        # Section headings (rows with no <td>) are not evacuation records
+        html, section_rows = _drop_section_header_rows(html)
+        qa.increment("non_geographic_rows_filtered", section_rows)
 
-            for table in tables:
-                rows = table.find_all("tr")
-                if not rows:
-                    continue
-
-                # Extract headers from first row
-                headers = [
-                    th.get_text(strip=True)
-                    for th in rows[0].find_all(["th", "td"])
-                ]
-
-                # Validate schema - only process evacuation tables
-                if not all(req in headers for req in REQUIRED_HEADERS):
-                    continue
-                
-                tables_matched += 1
-                print(f"  ✓ Found evacuation table with {len(rows)-1} rows")
-
-                active_rowspans = {}
-
-                for tr in rows[1:]:  # Skip header row
-                    cols = tr.find_all("td")
-                    if not cols:
-                        continue
-
-                    values = []
-                    col_idx = 0
-
-                    # Fill from previous rowspans (merged cells)
-                    while col_idx in active_rowspans:
-                        values.append(active_rowspans[col_idx]["value"])
-                        active_rowspans[col_idx]["rows_left"] -= 1
-                        if active_rowspans[col_idx]["rows_left"] == 0:
-                            del active_rowspans[col_idx]
-                        col_idx += 1
-
-                    # Process each cell
-                    for td in cols:
-                        text = td.get_text(strip=True)
-                        colspan = int(td.get("colspan", 1))
-                        rowspan = int(td.get("rowspan", 1))
-
-                        for _ in range(colspan):
-                            values.append(text)
-
-                            if rowspan > 1:
-                                active_rowspans[col_idx] = {
-                                    "value": text,
-                                    "rows_left": rowspan - 1
-                                }
-                            col_idx += 1
-
-                    # Pad row if shorter than headers
-                    if len(values) < len(headers):
-                        values += [""] * (len(headers) - len(values))
-
-                    # Trim if longer than headers
-                    values = values[:len(headers)]
-
-                    # Create row dictionary
-                    row = dict(zip(headers, values))
-                    
-                    # CRITICAL: Filter non-geographic section headers
-                    if row.get("Local Authority", "").lower() in NON_GEOGRAPHIC_LABELS:
-                        qa.increment("non_geographic_rows_filtered")
-                        continue
-                    
-                    # Add provenance metadata
-                    row.update({
-                        "source_url": url,
-                        "source_name": name,
-                        "source_tier": 1,
-                        "source_timestamp": datetime.now(UTC).isoformat(),
-                    })
-                    
-                    records.append(row)
-
-            print(f"  ✓ Extracted {len([r for r in records if r['source_name'] == name])} records from {name}")
+        # Keep cell text as scraped: no NaN coercion, thousands parsing or
+        # per-table type inference (every column is read through str, so
+        # "007" stays "007" and tables concatenate to one string schema)
+        try:
+            tables = pd.read_html(
+                StringIO(html),
+                flavor="lxml",
+                header=0,
+                thousands=None,
+                keep_default_na=False,
+                converters=defaultdict(lambda: str),
+            )
+        except ValueError:
+            # read_html raises when the page contains no tables
+            tables = []
+        tables_found += len(tables)
+        
+        if not tables:
+            print(f"  ⚠️ No tables found on page")
+            continue
+
+        source_records = 0
+        for table in tables:
+            # Validate schema - only process evacuation tables
+            if not all(req in table.columns for req in REQUIRED_HEADERS):
+                continue
             
-        except requests.RequestException as e:
-            print(f"  ✗ Failed to scrape {name}: {e}")
+            tables_matched += 1
+            print(f"  ✓ Found evacuation table with {len(table)} rows")
+
+            # CRITICAL: Filter non-geographic section headers
+            authority = table["Local Authority"].astype(str).str.lower()
+            section_headers = authority.isin(NON_GEOGRAPHIC_LABELS)
+            qa.increment("non_geographic_rows_filtered", int(section_headers.sum()))
+            table = table[~section_headers]
+            
+            # Add provenance metadata
+            table = table.assign(
+                source_url=url,
+                source_name=name,
+                source_tier=1,
+                source_timestamp=scraped_at,
+            )
+            
+            frames.append(table)
+            source_records += len(table)
+
+        print(f"  ✓ Extracted {source_records} records from {name}")
 
     # Validate results
     if tables_found == 0:
@@ -374,7 +548,7 @@ def scrape_wildfire_data(urls: Dict[str, str], qa: QASignals) -> pd.DataFrame:
         print(f"   Required: {REQUIRED_HEADERS}")
         print("   Page structure may have changed!")
 
-    df = pd.DataFrame(records)
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
     qa.update("records_scraped", len(df))
     
     print(f"\n{'='*60}")
@@ -425,7 +599,7 @@ def clean_wildfire_data(df: pd.DataFrame, qa: QASignals) -> pd.DataFrame:
             errors='coerce'
         )
         
-        records_with_dates = df["date_initiated_parsed"].notna().sum()
+        records_with_dates = df["date_initiated_parsed"].count()
         records_without_dates = len(df) - records_with_dates
         
         qa.update("records_with_dates", records_with_dates)
@@ -464,7 +638,9 @@ if __name__ == "__main__":
     
     # STEP 1: Scrape metadata and raw content
     print("\n[STEP 1] Scraping metadata and raw content...")
-    metadata_df, raw_text = scrape_tier1_sources(T1_URLS)
+    pages = fetch_pages(T1_URLS)
+    text_filename = os.path.join(paths.raw_text_dir, f"T1_raw_{run_timestamp}.txt")
+    metadata_df = scrape_tier1_sources(pages, text_filename)
     
     if not metadata_df.empty:
         print(f"\nMetadata preview:")
@@ -474,15 +650,11 @@ if __name__ == "__main__":
         metadata_df.to_csv("csv files/T1_Data.csv", index=False)
         print(f"\n✓ Metadata saved to: csv files/T1_Data.csv")
         
-        # Save processed text
-        text_filename = paths.raw_text_dir / f"T1_raw_{run_timestamp}.txt"
-        with open(text_filename, "w", encoding="utf-8") as f:
-            f.write(raw_text)
         print(f"✓ Processed text saved to: {text_filename}")
     
     # STEP 2: Extract structured evacuation data
     print("\n[STEP 2] Extracting structured evacuation data...")
-    wildfire_df = scrape_wildfire_data(T1_URLS, qa)
+    wildfire_df = scrape_wildfire_data(pages, qa)
     
     if wildfire_df.empty:
         print("\n⚠️ No evacuation data extracted. Check webpage structure.")
@@ -503,10 +675,14 @@ if __name__ == "__main__":
         wildfire_df.to_csv(versioned_filename, index=False)
         print(f"✓ Versioned output: {versioned_filename}")
         
-        # Save latest (overwrites)
-        wildfire_df.to_csv("csv files/T1_Wildfire_Evacs.csv", index=False)
+        # Save latest (overwrites) - same bytes, so copy instead of re-serializing
+        shutil.copyfile(versioned_filename, "csv files/T1_Wildfire_Evacs.csv")
         print(f"✓ Latest output: csv files/T1_Wildfire_Evacs.csv")
         
+        # Pipeline-internal copy for downstream stages
+        wildfire_df.to_parquet(paths.scraped_wildfire_parquet, index=False, compression="snappy")
+        print(f"✓ Parquet copy: {paths.scraped_wildfire_parquet}")
+        
         # Display sample
         print("\nSample of extracted data:")
         print(wildfire_df.head())
@@ -15,7 +15,10 @@ Functions:
     - export_all: Complete export pipeline
 """
 
+import os
+import shutil
 import pandas as pd
+import pyarrow as pa
 from typing import Optional, Dict, Any
 from io_paths import IOPaths
 
@@ -23,14 +26,20 @@ from io_paths import IOPaths
 class ExportManager:
     """Manage all data exports for the ETL pipeline."""
     
-    def __init__(self, paths: IOPaths):
+    def __init__(self, paths: IOPaths, dual_write_csv: bool = True):
         """
         Initialize export manager with IO paths configuration.
         
+        Tables with a Parquet copy are always written as Parquet; their CSV
+        versions are only written while ``dual_write_csv`` is on, so
+        downstream consumers can move over to Parquet gradually.
+        
         Args:
             paths (IOPaths): Configured IO paths object
+            dual_write_csv (bool): Also write CSV versions of Parquet tables
         """
         self.paths = paths
+        self.dual_write_csv = dual_write_csv
         self.export_log = []
     
     def _log_export(self, description: str, path: str, record_count: Optional[int] = None):
@@ -45,7 +54,8 @@ class ExportManager:
         log_entry = {
             "description": description,
             "path": path,
-            "record_count": record_count
+            "record_count": record_count,
+            "size_bytes": os.path.getsize(path)
         }
         self.export_log.append(log_entry)
         
@@ -54,6 +64,38 @@ class ExportManager:
         else:
             print(f"  ✓ {description}: {path}")
     
+    def _write_parquet(self, df: pd.DataFrame, path: str, description: str):
+        """
+        Write a table's Parquet copy and log it.
+        
+        Object columns are cast to the string dtype first so values of mixed
+        Python types (e.g. 5000 and "1,200") still convert to Arrow. While
+        CSV dual-writing is on, a failed write is reported and skipped: the
+        CSV written just before is then the newest copy, and read_intermediate
+        reads it instead.
+        
+        Args:
+            df (pd.DataFrame): Table to write
+            path (str): Parquet file path
+            description (str): Description for the export log
+        """
+        object_cols = df.columns[df.dtypes == object]
+        if len(object_cols):
+            df = df.astype({col: "str" for col in object_cols})
+        
+        try:
+            df.to_parquet(path, index=False, compression="snappy")
+        except (pa.ArrowException, OSError) as e:
+            if not self.dual_write_csv:
+                raise
+            # Never leave a partial file that would look newer than the CSV
+            if os.path.isfile(path):
+                os.remove(path)
+            print(f"  ⚠️ {description} not written ({e}); using the CSV copy")
+            return
+        
+        self._log_export(description, path, len(df))
+    
     def export_raw_html(self, source_name: str, html_content: str):
         """
         Export raw HTML from a data source.
@@ -64,8 +106,9 @@ class ExportManager:
         """
         path = self.paths.raw_html_path(source_name)
         
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # Encode once and write bytes: pages are saved exactly as fetched
+        with open(path, "wb") as f:
+            f.write(html_content.encode("utf-8"))
         
         self._log_export(f"Raw HTML ({source_name})", path)
     
@@ -78,8 +121,8 @@ class ExportManager:
         """
         path = self.paths.raw_text_path()
         
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(text_content)
+        with open(path, "wb") as f:
+            f.write(text_content.encode("utf-8"))
         
         self._log_export("Processed text", path)
     
@@ -102,15 +145,20 @@ class ExportManager:
         Args:
             wildfire_df (pd.DataFrame): Scraped wildfire evacuation data
         """
-        # Save latest (overwrites)
-        latest_path = self.paths.scraped_wildfire_latest
-        wildfire_df.to_csv(latest_path, index=False)
-        self._log_export("Scraped wildfire (latest)", latest_path, len(wildfire_df))
-        
-        # Save versioned
-        versioned_path = self.paths.scraped_wildfire_versioned
-        wildfire_df.to_csv(versioned_path, index=False)
-        self._log_export("Scraped wildfire (versioned)", versioned_path, len(wildfire_df))
+        if self.dual_write_csv:
+            # Save latest (overwrites)
+            latest_path = self.paths.scraped_wildfire_latest
+            wildfire_df.to_csv(latest_path, index=False)
+            self._log_export("Scraped wildfire (latest)", latest_path, len(wildfire_df))
+            
+            # Save versioned (byte-identical copy, so serialize only once)
+            versioned_path = self.paths.scraped_wildfire_versioned
+            shutil.copyfile(latest_path, versioned_path)
+            self._log_export("Scraped wildfire (versioned)", versioned_path, len(wildfire_df))
+        
+        # Save pipeline-internal Parquet copy of latest; written after the CSV
+        # so read_intermediate sees it as current
+        self._write_parquet(wildfire_df, self.paths.scraped_wildfire_parquet, "Scraped wildfire (parquet)")
     
     def export_cleaned_wildfire(self, cleaned_df: pd.DataFrame):
         """
@@ -119,10 +167,13 @@ class ExportManager:
         Args:
             cleaned_df (pd.DataFrame): Cleaned wildfire data
         """
-        path = self.paths.cleaned_wildfire
-        cleaned_df.to_csv(path, index=False)
+        if self.dual_write_csv:
+            path = self.paths.cleaned_wildfire
+            cleaned_df.to_csv(path, index=False)
+            
+            self._log_export("Cleaned wildfire data", path, len(cleaned_df))
         
-        self._log_export("Cleaned wildfire data", path, len(cleaned_df))
+        self._write_parquet(cleaned_df, self.paths.cleaned_wildfire_parquet, "Cleaned wildfire data (parquet)")
     
     def export_cleaned_census(self, census_df: pd.DataFrame):
         """
@@ -131,10 +182,13 @@ class ExportManager:
         Args:
             census_df (pd.DataFrame): Cleaned census demographic data
         """
-        path = self.paths.cleaned_census
-        census_df.to_csv(path, index=False)
+        if self.dual_write_csv:
+            path = self.paths.cleaned_census
+            census_df.to_csv(path, index=False)
+            
+            self._log_export("Cleaned census lookup", path, len(census_df))
         
-        self._log_export("Cleaned census lookup", path, len(census_df))
+        self._write_parquet(census_df, self.paths.cleaned_census_parquet, "Cleaned census lookup (parquet)")
     
     def export_matching_outputs(
         self, 
@@ -151,9 +205,12 @@ class ExportManager:
             low_confidence_df (pd.DataFrame, optional): Low-confidence matches
         """
         # Export main mapping
-        path = self.paths.authority_mapping
-        mapping_df.to_csv(path, index=False)
-        self._log_export("Authority-to-DGUID mapping", path, len(mapping_df))
+        if self.dual_write_csv:
+            path = self.paths.authority_mapping
+            mapping_df.to_csv(path, index=False)
+            self._log_export("Authority-to-DGUID mapping", path, len(mapping_df))
+        
+        self._write_parquet(mapping_df, self.paths.authority_mapping_parquet, "Authority-to-DGUID mapping (parquet)")
         
         # Export unmatched authorities
         if unmatched_df is not None and not unmatched_df.empty:
@@ -174,15 +231,35 @@ class ExportManager:
         Args:
             enriched_df (pd.DataFrame): Wildfire data enriched with census demographics
         """
-        # Save latest (overwrites)
-        latest_path = self.paths.enriched_wildfire_latest
-        enriched_df.to_csv(latest_path, index=False)
-        self._log_export("Enriched wildfire (latest)", latest_path, len(enriched_df))
+        if self.dual_write_csv:
+            # Save latest (overwrites)
+            latest_path = self.paths.enriched_wildfire_latest
+            enriched_df.to_csv(latest_path, index=False)
+            self._log_export("Enriched wildfire (latest)", latest_path, len(enriched_df))
+            
+            # Save versioned (byte-identical copy, so serialize only once)
+            versioned_path = self.paths.enriched_wildfire_versioned
+            shutil.copyfile(latest_path, versioned_path)
+            self._log_export("Enriched wildfire (versioned)", versioned_path, len(enriched_df))
+        
+        # Save pipeline-internal Parquet copy of latest; written after the CSV
+        # so read_intermediate sees it as current
+        self._write_parquet(enriched_df, self.paths.enriched_wildfire_parquet, "Enriched wildfire (parquet)")
+    
+    def main_output_paths(self) -> Dict[str, str]:
+        """
+        Paths of the final enriched outputs this manager writes.
         
-        # Save versioned
-        versioned_path = self.paths.enriched_wildfire_versioned
-        enriched_df.to_csv(versioned_path, index=False)
-        self._log_export("Enriched wildfire (versioned)", versioned_path, len(enriched_df))
+        Returns:
+            Dict[str, str]: Output label -> path (CSV latest/versioned while
+                dual-writing, otherwise the Parquet copy only)
+        """
+        if self.dual_write_csv:
+            return {
+                "Main Output": self.paths.enriched_wildfire_latest,
+                "Versioned": self.paths.enriched_wildfire_versioned,
+            }
+        return {"Main Output": self.paths.enriched_wildfire_parquet}
     
     def export_authority_audit(self, audit_df: pd.DataFrame):
         """
@@ -231,12 +308,14 @@ class ExportManager:
         summary.append("\n[EXPORTED FILES]")
         
         for i, entry in enumerate(self.export_log, 1):
+            size = f"{entry['size_bytes']:,} bytes"
             if entry["record_count"] is not None:
                 summary.append(
-                    f"  {i}. {entry['description']} ({entry['record_count']} records)"
+                    f"  {i}. {entry['description']} "
+                    f"({entry['record_count']} records, {size})"
                 )
             else:
-                summary.append(f"  {i}. {entry['description']}")
+                summary.append(f"  {i}. {entry['description']} ({size})")
             summary.append(f"     → {entry['path']}")
         
         summary.append("="*60 + "\n")
@@ -6,15 +6,23 @@ Part of the TRANSFORM stage in the ETL process.
 
 Functions:
     - normalize_name: Standardize place names for matching
+    - normalize_series: Vectorized normalize_name for a whole column
     - filter_non_geographic_rows: Remove section headers from wildfire data
     - parse_evacuation_dates: Standardize date formats
     - clean_wildfire_data: Complete cleaning pipeline for evacuation data
+    - load_census_csv: Read only the census columns the pipeline uses
     - clean_census_data: Prepare census lookup table
+    - build_census_lookup: Load + clean a census CSV, cached on disk
 """
 
+import hashlib
+import os
+import numpy as np
 import pandas as pd
+import re
+from functools import lru_cache
 from datetime import datetime
-from typing import Set
+from typing import Dict, Set, Tuple
 
 
 # CONFIGURATION
@@ -26,7 +34,52 @@ NON_GEOGRAPHIC_LABELS: Set[str] = {
     "evacuation alert"
 }
 
+# Common administrative prefixes to strip (first match wins)
+NAME_PREFIXES: Tuple[str, ...] = (
+    "town of ", 
+    "city of ", 
+    "rm of ", 
+    "r.m. of ", 
+    "rural municipality of ",
+    "municipality of ",
+    "village of ",
+    "northern village of "
+)
 
+# Date formats used on the evacuation pages, most common first; each is
+# parsed with a fixed strptime pattern instead of per-value inference
+EVACUATION_DATE_FORMATS: Tuple[str, ...] = (
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%Y-%m-%d"
+)
+
+# Census profile columns consumed by clean_census_data
+CENSUS_COLUMNS: Tuple[str, ...] = (
+    "GEO_LEVEL",
+    "CHARACTERISTIC_NAME",
+    "DGUID",
+    "ALT_GEO_CODE",
+    "GEO_NAME",
+    "C1_COUNT_TOTAL"
+)
+
+# Low-cardinality filter columns, read as categoricals so the GEO_LEVEL /
+# CHARACTERISTIC_NAME masks compare integer codes instead of strings
+CENSUS_CATEGORICAL_DTYPES: Dict[str, str] = {
+    "GEO_LEVEL": "category",
+    "CHARACTERISTIC_NAME": "category"
+}
+
+# Bump when clean_census_data's output schema changes so stale cached
+# lookups are not reused
+CENSUS_CACHE_VERSION = 2
+
+_PREFIX_PATTERN = "^(?:" + "|".join(re.escape(p) for p in NAME_PREFIXES) + ")"
+_PREFIX_RE = re.compile(_PREFIX_PATTERN)
+
+
+@lru_cache(maxsize=4096)
 def normalize_name(name: str) -> str:
     """
     Standardize place names for better matching across datasets.
@@ -51,22 +104,8 @@ def normalize_name(name: str) -> str:
     
     name = name.lower().strip()
     
-    # Common administrative prefixes to strip
-    prefixes = [
-        "town of ", 
-        "city of ", 
-        "rm of ", 
-        "r.m. of ", 
-        "rural municipality of ",
-        "municipality of ",
-        "village of ",
-        "northern village of "
-    ]
-    
-    for prefix in prefixes:
-        if name.startswith(prefix):
-            name = name[len(prefix):]
-            break  # Only remove first matching prefix
+    # Only remove first matching prefix
+    name = _PREFIX_RE.sub("", name, count=1)
     
     # Clean up extra spaces
     name = " ".join(name.split())
@@ -74,6 +113,26 @@ def normalize_name(name: str) -> str:
     return name
 
 
+def normalize_series(names: pd.Series) -> pd.Series:
+    """
+    Apply normalize_name to a whole Series using vectorized string methods.
+    
+    Args:
+        names (pd.Series): Original place names
+        
+    Returns:
+        pd.Series: Normalized place names ("" for missing/non-string values)
+    """
+    return (
+        names.str.lower()
+        .str.strip()
+        .str.replace(_PREFIX_PATTERN, "", n=1, regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .fillna("")
+    )
+
+
 def filter_non_geographic_rows(df: pd.DataFrame, authority_col: str = "Local Authority") -> pd.DataFrame:
     """
     Remove rows that contain section headers rather than geographic entities.
@@ -93,9 +152,12 @@ def filter_non_geographic_rows(df: pd.DataFrame, authority_col: str = "Local Aut
     
     initial_count = len(df)
     
-    # Filter out rows where authority column contains section headers
-    mask = ~df[authority_col].str.lower().isin(NON_GEOGRAPHIC_LABELS)
-    df_filtered = df[mask].copy()
+    # Filter out rows where authority column contains section headers.
+    # Test each distinct label once; the trailing False keeps missing
+    # authorities (factorize code -1) in the frame.
+    codes, uniques = pd.factorize(df[authority_col])
+    is_header = np.append(pd.Index(uniques).str.lower().isin(NON_GEOGRAPHIC_LABELS), False)
+    df_filtered = df[~is_header[codes]]
     
     filtered_count = initial_count - len(df_filtered)
     
@@ -105,7 +167,11 @@ def filter_non_geographic_rows(df: pd.DataFrame, authority_col: str = "Local Aut
     return df_filtered
 
 
-def parse_evacuation_dates(df: pd.DataFrame, date_col: str = "Date Evacuation Initiated") -> pd.DataFrame:
+def parse_evacuation_dates(
+    df: pd.DataFrame,
+    date_col: str = "Date Evacuation Initiated",
+    copy: bool = True
+) -> pd.DataFrame:
     """
     Parse and standardize evacuation date formats.
     
@@ -114,6 +180,7 @@ def parse_evacuation_dates(df: pd.DataFrame, date_col: str = "Date Evacuation In
     Args:
         df (pd.DataFrame): DataFrame containing evacuation data
         date_col (str): Name of the column containing date strings
+        copy (bool): Work on a copy; False adds the column to df in place
         
     Returns:
         pd.DataFrame: DataFrame with added 'date_initiated_parsed' column
@@ -126,15 +193,23 @@ def parse_evacuation_dates(df: pd.DataFrame, date_col: str = "Date Evacuation In
         print(f"  ⚠️ Warning: Column '{date_col}' not found")
         return df
     
-    df = df.copy()
+    if copy:
+        df = df.copy()
     
-    # Parse dates with error handling
-    df["date_initiated_parsed"] = pd.to_datetime(
-        df[date_col], 
-        errors='coerce'
-    )
+    # Parse dates with each known format in turn, only retrying what is left;
+    # anything else (e.g. day/month-ambiguous "06/07/2025") stays NaT and
+    # is reported below rather than guessed
+    dates = df[date_col]
+    parsed = pd.to_datetime(dates, format=EVACUATION_DATE_FORMATS[0], errors='coerce')
+    for fmt in EVACUATION_DATE_FORMATS[1:]:
+        missing = parsed.isna() & dates.notna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(dates[missing], format=fmt, errors='coerce')
     
-    parsed_count = df["date_initiated_parsed"].notna().sum()
+    df["date_initiated_parsed"] = parsed
+    
+    parsed_count = df["date_initiated_parsed"].count()
     failed_count = len(df) - parsed_count
     
     print(f"  → Parsed {parsed_count}/{len(df)} dates successfully")
@@ -147,7 +222,8 @@ def parse_evacuation_dates(df: pd.DataFrame, date_col: str = "Date Evacuation In
 def forward_fill_authorities(
     df: pd.DataFrame, 
     authority_col: str = "Local Authority",
-    date_col: str = "Date Evacuation Initiated"
+    date_col: str = "Date Evacuation Initiated",
+    copy: bool = True
 ) -> pd.DataFrame:
     """
     Forward-fill missing Local Authority values for merged table cells.
@@ -159,6 +235,7 @@ def forward_fill_authorities(
         df (pd.DataFrame): DataFrame with potential missing authorities
         authority_col (str): Name of the authority column
         date_col (str): Name of the date column (for validation)
+        copy (bool): Work on a copy; False fills df in place
         
     Returns:
         pd.DataFrame: DataFrame with filled authority values
@@ -169,21 +246,23 @@ def forward_fill_authorities(
     if authority_col not in df.columns:
         return df
     
-    df = df.copy()
+    if copy:
+        df = df.copy()
     
     # Count empty authorities before filling
     empty_before = df[authority_col].isna().sum() + (df[authority_col] == "").sum()
     
     # Replace empty strings with NA
-    df[authority_col] = df[authority_col].replace("", pd.NA)
+    authorities = df[authority_col].replace("", pd.NA)
     
-    # Only forward-fill for rows with valid dates
+    # Only forward-fill for rows with valid dates: undated rows neither
+    # receive nor carry a value, so blank them out for the fill only
     if date_col in df.columns:
         mask = df[date_col].notna() & (df[date_col] != "")
-        df.loc[mask, authority_col] = df.loc[mask, authority_col].ffill()
+        df[authority_col] = authorities.where(mask).ffill().where(mask, authorities)
     else:
         # If no date column, fill all
-        df[authority_col] = df[authority_col].ffill()
+        df[authority_col] = authorities.ffill()
     
     # Count filled cells
     empty_after = df[authority_col].isna().sum()
@@ -195,7 +274,7 @@ def forward_fill_authorities(
     return df
 
 
-def generate_event_ids(df: pd.DataFrame) -> pd.DataFrame:
+def generate_event_ids(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """
     Generate unique event identifiers for each evacuation record.
     
@@ -203,11 +282,13 @@ def generate_event_ids(df: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         df (pd.DataFrame): DataFrame with source, authority, and date columns
+        copy (bool): Work on a copy; False adds the column to df in place
         
     Returns:
         pd.DataFrame: DataFrame with added 'event_id' column
     """
-    df = df.copy()
+    if copy:
+        df = df.copy()
     
     # Build event ID from available columns
     source = df.get("source_name", "unknown").fillna("unknown")
@@ -257,33 +338,64 @@ def clean_wildfire_data(df: pd.DataFrame) -> pd.DataFrame:
         print("  ⚠️ No data to clean")
         return df
     
+    # One working frame for all steps: a shallow copy is enough, since
+    # copy-on-write only duplicates the columns the steps below overwrite
+    df = df.copy(deep=False)
+    
     # Step 1: Filter non-geographic rows
     print("Step 1: Filtering non-geographic rows...")
     df = filter_non_geographic_rows(df)
     
     # Step 2: Forward-fill authorities (for merged cells)
     print("Step 2: Forward-filling authorities...")
-    df = forward_fill_authorities(df)
+    df = forward_fill_authorities(df, copy=False)
     
     # Step 3: Parse dates
     print("Step 3: Parsing dates...")
-    df = parse_evacuation_dates(df)
+    df = parse_evacuation_dates(df, copy=False)
     
     # Step 4: Normalize authority names for matching
     print("Step 4: Normalizing authority names...")
     if "Local Authority" in df.columns:
-        df["LA_NORM"] = df["Local Authority"].apply(normalize_name)
+        # Authorities repeat across events: normalize each distinct name once
+        codes, uniques = pd.factorize(df["Local Authority"])
+        normalized = normalize_series(pd.Series(uniques, dtype=object)).to_numpy(dtype=object)
+        df["LA_NORM"] = pd.Series(
+            np.where(codes >= 0, normalized[codes], ""), index=df.index, dtype="str"
+        )
         print(f"  → Created normalized name column")
     
     # Step 5: Generate event IDs
     print("Step 5: Generating event IDs...")
-    df = generate_event_ids(df)
+    df = generate_event_ids(df, copy=False)
     
     print(f"\n✓ Cleaning complete: {len(df)} records processed")
     
     return df
 
 
+def load_census_csv(census_path: str) -> pd.DataFrame:
+    """
+    Load a Statistics Canada census profile CSV for clean_census_data.
+    
+    The profile file has dozens of columns, so only CENSUS_COLUMNS are
+    parsed, using the multithreaded PyArrow CSV reader. The filter columns
+    are loaded as categoricals (CENSUS_CATEGORICAL_DTYPES).
+    
+    Args:
+        census_path (str): Path to census profile CSV
+        
+    Returns:
+        pd.DataFrame: Census rows limited to CENSUS_COLUMNS
+    """
+    return pd.read_csv(
+        census_path,
+        engine="pyarrow",
+        usecols=list(CENSUS_COLUMNS),
+        dtype=CENSUS_CATEGORICAL_DTYPES
+    )
+
+
 def clean_census_data(census_df: pd.DataFrame) -> pd.DataFrame:
     """
     Prepare census data for matching and enrichment.
@@ -306,41 +418,62 @@ def clean_census_data(census_df: pd.DataFrame) -> pd.DataFrame:
     """
     print("\n[CLEANING CENSUS DATA]")
     
-    # Filter to Census Subdivision level only
-    csd = census_df[census_df["GEO_LEVEL"] == "Census subdivision"].copy()
+    # Filter to Census Subdivision level only, keeping just the columns used below
+    # (slices are only projected/renamed, never mutated, so no defensive copies)
+    csd_mask = (census_df["GEO_LEVEL"] == "Census subdivision").to_numpy()
+    csd = census_df.loc[csd_mask, [
+        "DGUID", "ALT_GEO_CODE", "GEO_NAME", "CHARACTERISTIC_NAME", "C1_COUNT_TOTAL"
+    ]]
     print(f"  → Filtered to {len(csd)} Census Subdivision records")
     
     # Extract total population
-    census_pop = csd[csd["CHARACTERISTIC_NAME"] == "Population, 2021"].copy()
-    census_pop = census_pop[["DGUID", "ALT_GEO_CODE", "GEO_NAME", "C1_COUNT_TOTAL"]]
-    census_pop = census_pop.rename(columns={"C1_COUNT_TOTAL": "POP_2021"})
+    census_pop = csd.loc[
+        csd["CHARACTERISTIC_NAME"] == "Population, 2021",
+        ["DGUID", "ALT_GEO_CODE", "GEO_NAME", "C1_COUNT_TOTAL"]
+    ].rename(columns={"C1_COUNT_TOTAL": "POP_2021"})
     
     # Normalize names for matching
-    census_pop["GEO_NAME_NORM"] = census_pop["GEO_NAME"].apply(normalize_name)
-    
-    # Extract Indigenous population
-    ind_tot = csd[csd["CHARACTERISTIC_NAME"] == "Indigenous identity"][
-        ["DGUID", "C1_COUNT_TOTAL"]
-    ].rename(columns={"C1_COUNT_TOTAL": "INDIG_POP_2021"})
-    
-    # Get denominator for Indigenous identity
-    denom = csd[
-        csd["CHARACTERISTIC_NAME"] == "Total population in private households by Indigenous identity"
-    ][["DGUID", "C1_COUNT_TOTAL"]].rename(
-        columns={"C1_COUNT_TOTAL": "INDIG_DENOM_2021"}
+    census_pop["GEO_NAME_NORM"] = normalize_series(census_pop["GEO_NAME"])
+    
+    # Extract Indigenous population and its denominator in one pivot
+    indig_chars = {
+        "Indigenous identity": "INDIG_POP_2021",
+        "Total population in private households by Indigenous identity": "INDIG_DENOM_2021",
+    }
+    indig = (
+        csd[csd["CHARACTERISTIC_NAME"].isin(indig_chars.keys())]
+        .pivot_table(
+            index="DGUID",
+            columns="CHARACTERISTIC_NAME",
+            values="C1_COUNT_TOTAL",
+            aggfunc="first",
+            observed=True
+        )
+        .reindex(columns=list(indig_chars.keys()))
+        .rename(columns=indig_chars)
+        .reset_index()
     )
+    indig.columns.name = None
     
     # Merge all demographic data
-    census_clean = (
-        census_pop
-        .merge(ind_tot, on="DGUID", how="left")
-        .merge(denom, on="DGUID", how="left")
+    census_clean = census_pop.merge(indig, on="DGUID", how="left")
+    
+    # Calculate Indigenous share (NaN where the denominator is missing or 0)
+    indig_pop = census_clean["INDIG_POP_2021"].to_numpy(dtype=np.float64, na_value=np.nan)
+    indig_denom = census_clean["INDIG_DENOM_2021"].to_numpy(dtype=np.float64, na_value=np.nan)
+    census_clean["INDIG_SHARE_2021"] = np.divide(
+        indig_pop,
+        indig_denom,
+        out=np.full_like(indig_pop, np.nan),
+        where=indig_denom > 0
     )
     
-    # Calculate Indigenous share
-    census_clean["INDIG_SHARE_2021"] = (
-        census_clean["INDIG_POP_2021"] / census_clean["INDIG_DENOM_2021"]
-    )
+    # Counts fit in 32 bits; nullable Int32 keeps them integral when missing
+    census_clean = census_clean.astype({
+        "POP_2021": "Int32",
+        "INDIG_POP_2021": "Int32",
+        "INDIG_DENOM_2021": "Int32"
+    })
     
     print(f"✓ Census cleaning complete: {len(census_clean)} geographic units")
     print(f"  Columns: {', '.join(census_clean.columns)}")
@@ -348,20 +481,80 @@ def clean_census_data(census_df: pd.DataFrame) -> pd.DataFrame:
     return census_clean
 
 
+@lru_cache(maxsize=4)
+def _cached_census_lookup(census_path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """
+    Load a census lookup through the on-disk cache, memoized per process.
+    
+    mtime_ns and size only key the in-process memo, so an edited file is
+    re-read; the on-disk cache is keyed by content (see build_census_lookup).
+    """
+    from io_paths import IOPaths
+    
+    # Hash the whole file (streamed in chunks): a same-size edit anywhere,
+    # such as a corrected count, must change the key
+    with open(census_path, "rb") as f:
+        content_hash = hashlib.file_digest(f, "sha1").hexdigest()[:16]
+    signature = f"v{CENSUS_CACHE_VERSION}_{size}_{content_hash}"
+    cache_path = IOPaths().census_lookup_cache(signature)
+    
+    if os.path.exists(cache_path):
+        print(f"  → Using cached census lookup: {cache_path}")
+        return pd.read_parquet(cache_path)
+    
+    census_clean = clean_census_data(load_census_csv(census_path))
+    census_clean.to_parquet(cache_path, index=False, compression="snappy")
+    print(f"  → Cached census lookup: {cache_path}")
+    
+    return census_clean
+
+
+def build_census_lookup(census_path: str, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Build the cleaned census lookup from a census CSV, reusing a cached copy.
+    
+    The lookup (including GEO_NAME_NORM) is cached as Parquet keyed by the
+    CSV's size, a hash of its full contents and CENSUS_CACHE_VERSION, so it is
+    only rebuilt when the census file's content or the lookup schema
+    changes; copies or re-checkouts reuse the cache. Within a process the
+    loaded lookup is also memoized per (path, mtime, size).
+    
+    Args:
+        census_path (str): Path to census profile CSV
+        use_cache (bool): Use the on-disk and in-process caches (False forces a rebuild)
+        
+    Returns:
+        pd.DataFrame: Cleaned census lookup table (see clean_census_data)
+    """
+    if not use_cache:
+        return clean_census_data(load_census_csv(census_path))
+    
+    stat = os.stat(census_path)
+    census_lookup = _cached_census_lookup(
+        os.path.abspath(census_path), stat.st_mtime_ns, stat.st_size
+    )
+    
+    # Shallow copy so callers adding columns don't alter the memoized frame
+    return census_lookup.copy(deep=False)
+
+
 if __name__ == "__main__":
     # Example usage
     print("="*60)
     print("CLEANING MODULE - STANDALONE TEST")
     print("="*60)
     
+    from io_paths import read_intermediate
+    
     # Test wildfire cleaning
-    wildfire_df = pd.read_csv("csv files/T1_Wildfire_Evacs.csv")
+    wildfire_df = read_intermediate("csv files/T1_Wildfire_Evacs.csv")
     wildfire_clean = clean_wildfire_data(wildfire_df)
     wildfire_clean.to_csv("csv files/T1_Wildfire_Evacs_cleaned.csv", index=False)
+    wildfire_clean.to_parquet("csv files/T1_Wildfire_Evacs_cleaned.parquet", index=False, compression="snappy")
     
     # Test census cleaning
-    census_df = pd.read_csv("csv files/Manitoba_2021_Census.csv")
-    census_clean = clean_census_data(census_df)
+    census_clean = build_census_lookup("csv files/Manitoba_2021_Census.csv")
     census_clean.to_csv("csv files/census_lookup_cleaned.csv", index=False)
+    census_clean.to_parquet("csv files/census_lookup_cleaned.parquet", index=False, compression="snappy")
     
     print("\n✓ Test complete - cleaned files saved")
\ No newline at end of file
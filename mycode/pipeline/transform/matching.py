@@ -12,9 +12,12 @@ Functions:
     - enrich_with_census: Add census demographics to wildfire data
 """
 
+import array
+import heapq
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
-from thefuzz import process
+from typing import Callable, Dict, List, Optional, Tuple
+from rapidfuzz import fuzz, process, utils
 import os
 
 
@@ -26,28 +29,49 @@ class MatchReport:
         self.matched_authorities = 0
         self.unmatched_authorities = []
         self.low_confidence_matches = []
-        self.match_scores = []
+        self.match_scores = array.array('B')  # scores are 0-100, one byte each
         self.enriched_records = 0
         self.total_records = 0
     
-    def add_match(self, authority: str, score: int, dguid: str = None):
-        """Record a match attempt."""
-        self.total_authorities += 1
-        self.match_scores.append(score)
+    def add_matches(
+        self,
+        authorities: List[str],
+        scores: np.ndarray,
+        dguids: np.ndarray,
+        needs_review: Optional[np.ndarray] = None
+    ):
+        """
+        Record a batch of match attempts.
         
-        if dguid:
-            self.matched_authorities += 1
-            if score < 90:  # Flag low confidence matches
-                self.low_confidence_matches.append({
-                    'authority': authority,
-                    'score': score,
-                    'dguid': dguid
-                })
-        else:
-            self.unmatched_authorities.append({
-                'authority': authority,
-                'score': score
-            })
+        An attempt with a DGUID counts as matched and is flagged as low
+        confidence when its score is below 90 or needs_review is set for it;
+        one without a DGUID is recorded as unmatched.
+        """
+        scores = np.asarray(scores, dtype=np.int64)
+        dguids = np.asarray(dguids, dtype=object)
+        authorities = np.asarray(authorities, dtype=object)
+        if needs_review is None:
+            needs_review = np.zeros(len(scores), dtype=bool)
+        
+        matched = np.array([bool(d) for d in dguids], dtype=bool)
+        low_confidence = matched & ((scores < 90) | needs_review)  # Flag low confidence matches
+        
+        self.total_authorities += len(scores)
+        self.matched_authorities += int(matched.sum())
+        self.match_scores.extend(scores.tolist())
+        
+        self.low_confidence_matches.extend(
+            {'authority': a, 'score': s, 'dguid': d}
+            for a, s, d in zip(
+                authorities[low_confidence].tolist(),
+                scores[low_confidence].tolist(),
+                dguids[low_confidence].tolist()
+            )
+        )
+        self.unmatched_authorities.extend(
+            {'authority': a, 'score': s}
+            for a, s in zip(authorities[~matched].tolist(), scores[~matched].tolist())
+        )
     
     def set_enrichment_stats(self, enriched: int, total: int):
         """Set record-level enrichment statistics."""
@@ -71,12 +95,17 @@ class MatchReport:
         if not self.match_scores:
             return {}
         
+        # Bin all scores in one pass: <70, 70-79, 80-89, 90-99, 100
+        scores = np.frombuffer(self.match_scores, dtype=np.uint8)
+        bins = np.digitize(scores, [70, 80, 90, 100])
+        poor, fair, good, excellent, perfect = np.bincount(bins, minlength=5).tolist()
+        
         distribution = {
-            "Perfect (100)": sum(1 for s in self.match_scores if s == 100),
-            "Excellent (90-99)": sum(1 for s in self.match_scores if 90 <= s < 100),
-            "Good (80-89)": sum(1 for s in self.match_scores if 80 <= s < 90),
-            "Fair (70-79)": sum(1 for s in self.match_scores if 70 <= s < 80),
-            "Poor (<70)": sum(1 for s in self.match_scores if s < 70),
+            "Perfect (100)": perfect,
+            "Excellent (90-99)": excellent,
+            "Good (80-89)": good,
+            "Fair (70-79)": fair,
+            "Poor (<70)": poor,
         }
         return distribution
     
@@ -110,7 +139,7 @@ class MatchReport:
         if self.low_confidence_matches:
             report.append(f"\n[LOW CONFIDENCE MATCHES] ({len(self.low_confidence_matches)} total)")
             report.append("  Top 5 matches to review:")
-            for match in sorted(self.low_confidence_matches, key=lambda x: x['score'])[:5]:
+            for match in heapq.nsmallest(5, self.low_confidence_matches, key=lambda x: x['score']):
                 report.append(f"    - {match['authority']}: score={match['score']}")
         
         # Unmatched authorities
@@ -150,13 +179,22 @@ def fuzzy_match_authorities(
     census_df: pd.DataFrame,
     score_cutoff: int = 80,
     authority_col: str = "LA_NORM",
-    census_name_col: str = "GEO_NAME_NORM"
+    census_name_col: str = "GEO_NAME_NORM",
+    scorer: Callable = fuzz.token_set_ratio
 ) -> Tuple[pd.DataFrame, MatchReport]:
     """
     Match wildfire Local Authorities to census geographies using fuzzy matching.
     
     Uses the Levenshtein distance algorithm to find best matches between
-    normalized authority names and census geography names.
+    normalized authority names and census geography names. All authorities
+    are scored against all census names in a single RapidFuzz cdist call.
+    
+    The default token_set_ratio is a single pass per comparison (WRatio runs
+    several) and ignores word order/extra tokens, which suits short, already
+    prefix-stripped place names. Because it scores subset names equally
+    (e.g. "thompson" vs "thompson lake"), ties at the top are broken by
+    plain ratio, and a non-exact 100 whose sorted tokens differ is reported
+    as a low-confidence match.
     
     Args:
         wildfire_df (pd.DataFrame): Cleaned wildfire data with normalized names
@@ -164,6 +202,7 @@ def fuzzy_match_authorities(
         score_cutoff (int): Minimum match score (0-100) to accept
         authority_col (str): Column name for normalized authority names
         census_name_col (str): Column name for normalized census names
+        scorer (Callable): RapidFuzz scorer used to compare names
         
     Returns:
         Tuple[pd.DataFrame, MatchReport]: 
@@ -175,65 +214,101 @@ def fuzzy_match_authorities(
     # Initialize match report
     report = MatchReport()
     
-    # Get unique authorities from wildfire data
+    # Get unique authorities from wildfire data (the normalized name is
+    # derived from the original, so deduplicating on it alone is enough)
     unique_authorities = wildfire_df[[
         "Local Authority", authority_col
-    ]].drop_duplicates()
+    ]].drop_duplicates(subset="Local Authority")
     
     print(f"  Matching {len(unique_authorities)} unique authorities...")
     
+    la_original = unique_authorities["Local Authority"].to_numpy(dtype=object)
+    la_normalized = unique_authorities[authority_col].fillna("").to_numpy(dtype=object)
+    
     # Prepare census choices for fuzzy matching
     census_choices = census_df[census_name_col].tolist()
-    
-    matches = []
-    
-    for _, row in unique_authorities.iterrows():
-        la_original = row["Local Authority"]
-        la_normalized = row[authority_col]
+    census_names = np.asarray(census_choices, dtype=object)
+    census_dguids = census_df["DGUID"].to_numpy(dtype=object)
+    
+    # Empty authorities are never matched
+    has_name = la_normalized != ""
+    match_idx = np.zeros(len(la_normalized), dtype=np.intp)
+    match_score = np.zeros(len(la_normalized), dtype=np.int64)
+    needs_review = np.zeros(len(la_normalized), dtype=bool)
+    
+    # Score each distinct normalized name against each distinct census name in
+    # one batch; raw spellings that normalize to the same key share the result,
+    # and a duplicated census name resolves to its first row
+    if has_name.any() and census_choices:
+        key_codes, unique_keys = pd.factorize(la_normalized[has_name])
+        choice_codes, unique_choices = pd.factorize(
+            pd.Series(census_choices, dtype=object), use_na_sentinel=False
+        )
+        _, choice_first_row = np.unique(choice_codes, return_index=True)
         
-        # Skip empty authorities
-        if not la_normalized:
-            report.add_match(la_original, 0, None)
-            matches.append({
-                "Local Authority": la_original,
-                "match_name": None,
-                "match_score": 0,
-                "DGUID": None,
-            })
-            continue
+        # Exact name hits are a hash lookup; only misses go to the fuzzy scorer
+        best_idx = pd.Index(unique_choices).get_indexer(unique_keys)
+        best_score = np.full(len(unique_keys), 100.0)
+        key_needs_review = np.zeros(len(unique_keys), dtype=bool)
+        fuzzy_rows = np.flatnonzero(best_idx < 0)
         
-        # Find best fuzzy match
-        match_result = process.extractOne(la_normalized, census_choices)
-        
-        if match_result:
-            match_name, score = match_result
-        else:
-            match_name, score = None, 0
-        
-        # Accept match if score meets cutoff
-        if score >= score_cutoff:
-            # Find the DGUID for the matched name
-            census_row = census_df[census_df[census_name_col] == match_name].iloc[0]
-            dguid = census_row["DGUID"]
-            report.add_match(la_original, score, dguid)
+        if len(fuzzy_rows):
+            fuzzy_keys = unique_keys[fuzzy_rows]
+            scores = process.cdist(
+                fuzzy_keys.tolist(),
+                unique_choices.tolist(),
+                scorer=scorer,
+                processor=utils.default_process,
+                workers=-1
+            )
+            fuzzy_idx = scores.argmax(axis=1)
+            fuzzy_score = scores[np.arange(len(fuzzy_keys)), fuzzy_idx]
+            
+            # Break ties between acceptable candidates by plain ratio
+            tied = ((scores == fuzzy_score[:, None]).sum(axis=1) > 1) & (fuzzy_score >= score_cutoff)
+            for row in np.flatnonzero(tied):
+                candidates = np.flatnonzero(scores[row] == fuzzy_score[row])
+                tie_scores = [
+                    fuzz.ratio(fuzzy_keys[row], unique_choices[c], processor=utils.default_process)
+                    for c in candidates
+                ]
+                fuzzy_idx[row] = candidates[int(np.argmax(tie_scores))]
+            
+            # token_set_ratio scores any token subset at 100 ("lake" vs
+            # "cross lake"). Subset names are still how bare names reach
+            # "... first nation" geographies, so keep the match but send it
+            # for review unless the sorted tokens agree as well
+            for row in np.flatnonzero(fuzzy_score == 100):
+                key_needs_review[fuzzy_rows[row]] = fuzz.token_sort_ratio(
+                    fuzzy_keys[row], unique_choices[fuzzy_idx[row]], processor=utils.default_process
+                ) < 100
             
-            matches.append({
-                "Local Authority": la_original,
-                "match_name": match_name,
-                "match_score": score,
-                "DGUID": dguid,
-            })
-        else:
-            # No acceptable match found
-            report.add_match(la_original, score, None)
-            matches.append({
-                "Local Authority": la_original,
-                "match_name": match_name if match_name else None,
-                "match_score": score,
-                "DGUID": None,
-            })
-    
-    mapping_df = pd.DataFrame(matches)
+            best_idx[fuzzy_rows] = fuzzy_idx
+            best_score[fuzzy_rows] = fuzzy_score
+        
+        match_idx[has_name] = choice_first_row[best_idx][key_codes]
+        match_score[has_name] = np.rint(best_score)[key_codes]
+        needs_review[has_name] = key_needs_review[key_codes]
+    else:
+        has_name[:] = False
+    
+    # Accept match if score meets cutoff
+    accepted = has_name & (match_score >= score_cutoff)
+    if census_choices:
+        match_name = np.where(has_name, census_names[match_idx], None)
+        dguids = np.where(accepted, census_dguids[match_idx], None)
+    else:
+        match_name = np.full(len(la_normalized), None, dtype=object)
+        dguids = np.full(len(la_normalized), None, dtype=object)
+    
+    report.add_matches(la_original, match_score, dguids, needs_review)
+    
+    mapping_df = pd.DataFrame({
+        "Local Authority": la_original,
+        "match_name": match_name,
+        "match_score": match_score,
+        "DGUID": dguids,
+    })
     
     print(f"  ✓ Matched {report.matched_authorities}/{report.total_authorities} authorities")
     print(f"  ✓ Match rate: {report.get_match_rate():.1f}%")
@@ -267,17 +342,17 @@ def enrich_with_census(
     
     df = wildfire_df.copy()
     
-    # Create lookup dictionary from mapping
-    authority_to_dguid = dict(
-        zip(mapping_df["Local Authority"], mapping_df["DGUID"])
-    )
+    # Hash-indexed lookup from mapping (last entry wins for repeated names)
+    authority_to_dguid = mapping_df.set_index("Local Authority")["DGUID"]
+    authority_to_dguid = authority_to_dguid[
+        ~authority_to_dguid.index.duplicated(keep="last")
+    ]
     
     # Map authorities to DGUIDs
     df["DGUID"] = df["Local Authority"].map(authority_to_dguid)
     
-    # Select census columns to join
-    census_cols = census_df[[
-        "DGUID", 
+    # Census lookup indexed by DGUID
+    census_lookup = census_df.set_index("DGUID")[[
         "POP_2021", 
         "INDIG_POP_2021", 
         "INDIG_SHARE_2021"
@@ -288,9 +363,9 @@ def enrich_with_census(
     })
     
     # Join census data
-    df = df.merge(census_cols, on="DGUID", how="left")
+    df = df.join(census_lookup, on="DGUID")
     
-    enriched_count = df["DGUID"].notna().sum()
+    enriched_count = df["DGUID"].count()
     print(f"  ✓ Enriched {enriched_count}/{len(df)} records with census data")
     print(f"  ✓ Enrichment rate: {(enriched_count/len(df)*100):.1f}%")
     
@@ -301,7 +376,8 @@ def create_matching_pipeline(
     wildfire_df: pd.DataFrame,
     census_df: pd.DataFrame,
     score_cutoff: int = 80,
-    output_dir: str = "csv files"
+    output_dir: str = "csv files",
+    dual_write_csv: bool = True
 ) -> Tuple[pd.DataFrame, MatchReport]:
     """
     Complete matching and enrichment pipeline.
@@ -314,6 +390,8 @@ def create_matching_pipeline(
         census_df (pd.DataFrame): Cleaned census data
         score_cutoff (int): Minimum match score threshold
         output_dir (str): Directory for output files
+        dual_write_csv (bool): Save the authority mapping as CSV; when off
+            only its Parquet copy is written
         
     Returns:
         Tuple[pd.DataFrame, MatchReport]:
@@ -335,7 +413,7 @@ def create_matching_pipeline(
     enriched_df = enrich_with_census(wildfire_df, census_df, mapping_df)
     
     # Update match report with enrichment stats
-    enriched_count = enriched_df["DGUID"].notna().sum()
+    enriched_count = enriched_df["DGUID"].count()
     match_report.set_enrichment_stats(enriched_count, len(enriched_df))
     
     # Step 3: Save outputs
@@ -344,8 +422,12 @@ def create_matching_pipeline(
     os.makedirs("qa_reports", exist_ok=True)
     
     # Save mapping for inspection
-    mapping_path = f"{output_dir}/authority_to_dguid_mapping.csv"
-    mapping_df.to_csv(mapping_path, index=False)
+    if dual_write_csv:
+        mapping_path = f"{output_dir}/authority_to_dguid_mapping.csv"
+        mapping_df.to_csv(mapping_path, index=False)
+    else:
+        mapping_path = f"{output_dir}/authority_to_dguid_mapping.parquet"
+        mapping_df.to_parquet(mapping_path, index=False, compression="snappy")
     print(f"  ✓ Saved mapping to {mapping_path}")
     
     # Save unmatched authorities
@@ -357,12 +439,13 @@ def create_matching_pipeline(
     match_report.save_low_confidence(low_conf_path)
     
     # Generate and display report
-    print(match_report.generate_report())
+    report_text = match_report.generate_report()
+    print(report_text)
     
     # Save report to file
     report_path = "qa_reports/match_quality_report.txt"
     with open(report_path, "w", encoding="utf-8") as f:
-        f.write(match_report.generate_report())
+        f.write(report_text)
     print(f"✓ Match quality report saved to {report_path}\n")
     
     return enriched_df, match_report
@@ -371,7 +454,8 @@ def create_matching_pipeline_with_designated_places(
     wildfire_df: pd.DataFrame,
     census_df: pd.DataFrame,
     score_cutoff: int = 80,
-    output_dir: str = "csv files"
+    output_dir: str = "csv files",
+    dual_write_csv: bool = True
 ) -> tuple[pd.DataFrame, 'MatchReport']:
     """Enhanced matching pipeline including GNBC designated places."""
     from pipeline.extract.special_places import enrich_with_designated_places
@@ -383,7 +467,8 @@ def create_matching_pipeline_with_designated_places(
         wildfire_df,
         census_df,
         score_cutoff,
-        output_dir
+        output_dir,
+        dual_write_csv
     )
     
     # Step 2: Add GNBC designated places for unmatched
@@ -400,9 +485,11 @@ if __name__ == "__main__":
     print("MATCHING MODULE - STANDALONE TEST")
     print("="*60)
     
+    from io_paths import read_intermediate
+    
     # Load cleaned data (assuming cleaning.py was run first)
-    wildfire_df = pd.read_csv("csv files/T1_Wildfire_Evacs_cleaned.csv")
-    census_df = pd.read_csv("csv files/census_lookup_cleaned.csv")
+    wildfire_df = read_intermediate("csv files/T1_Wildfire_Evacs_cleaned.csv")
+    census_df = read_intermediate("csv files/census_lookup_cleaned.csv")
     
     # Run matching pipeline
     enriched_df, report = create_matching_pipeline(
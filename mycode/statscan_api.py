@@ -2,12 +2,50 @@
 Statistics Canada Census Data API Fetcher
 """
 
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
-from io import StringIO
+from functools import lru_cache
+import tempfile
+import time
 import zipfile
-import io
-from typing import Optional
+from typing import BinaryIO, Optional
+from io_paths import IOPaths
+
+# Trailing ", Manitoba ..." qualifier on API geography names. Kept as a pattern
+# string: pandas runs string patterns in Arrow's regex kernel, while a compiled
+# re.Pattern drops to a per-element Python fallback.
+_PROVINCE_SUFFIX_PATTERN = r',\s*Manitoba.*'
+
+# Shared HTTP session - retries transient StatCan failures with backoff
+# (honouring Retry-After) before fetch_manitoba_census_2021 falls back
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+    respect_retry_after_header=True
+)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=_RETRY))
+
+# The 2021 Census Profile is static reference data; reuse a downloaded extract
+CENSUS_PROFILE_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+# Header spellings seen across Census Profile downloads, in preference order
+_CHAR_COLUMNS = ('CHARACTERISTIC_NAME', 'Characteristic', 'CHARACTERISTIC')
+_GEO_CODE_COLUMNS = ('GEO_CODE (POR)', 'DGUID', 'GEO_CODE', 'GeoUID')
+_GEO_NAME_COLUMNS = ('GEO_NAME', 'Geographic name', 'GeoName')
+_DATA_COLUMNS = ('C1_COUNT_TOTAL', 'Total', 'C1', 'VALUE')
+
+# Low-cardinality label columns repeated on every row, stored as categoricals
+_CATEGORICAL_DTYPES = {'GEO_LEVEL': 'category', 'CHARACTERISTIC_NAME': 'category'}
+
+# Only these columns are parsed; the profile has dozens of rate/gender columns
+_PROFILE_COLUMNS = frozenset(_CHAR_COLUMNS + _GEO_CODE_COLUMNS + _GEO_NAME_COLUMNS + _DATA_COLUMNS)
 
 
 class CensusQASignals:
@@ -26,7 +64,10 @@ class CensusQASignals:
         return "\n".join(lines)
 
 
-def fetch_manitoba_census_2021(qa_signals: Optional[CensusQASignals] = None) -> pd.DataFrame:
+def fetch_manitoba_census_2021(
+    qa_signals: Optional[CensusQASignals] = None,
+    force_refresh: bool = False
+) -> pd.DataFrame:
     if qa_signals is None:
         qa_signals = CensusQASignals()
     
@@ -35,37 +76,73 @@ def fetch_manitoba_census_2021(qa_signals: Optional[CensusQASignals] = None) ->
     qa_signals.add('geographic_level', 'Census Subdivision (CSD)')
     qa_signals.add('province', 'Manitoba')
     
+    cache_path = IOPaths().census_profile_cache
+    census_df = None if force_refresh else _load_cached_profile(cache_path)
+    if census_df is not None:
+        qa_signals.add('api_cache_hit', True)
+        qa_signals.add('fetch_method', 'Cache - Census Profile')
+        qa_signals.add('characteristics_rows_returned', len(census_df))
+        return census_df
+    
     try:
         census_df = fetch_via_census_profile(qa_signals)
-        qa_signals.add('fetch_method', 'API - Census Profile')
-        return census_df
     except Exception as e:
         qa_signals.add('api_error', str(e))
         qa_signals.add('fetch_method', 'Fallback - Embedded Data')
         return fetch_via_fallback(qa_signals)
+    
+    qa_signals.add('fetch_method', 'API - Census Profile')
+    
+    # The cache only saves a re-download; a read-only checkout, full disk or
+    # missing Parquet engine must not fail a fetch that succeeded
+    try:
+        census_df.to_parquet(cache_path, index=False, compression="snappy")
+    except (OSError, ImportError, TypeError, ValueError) as e:
+        qa_signals.add('api_cache_write_error', str(e))
+    return census_df
+
+
+def _load_cached_profile(cache_path: str) -> Optional[pd.DataFrame]:
+    """Return the cached Census Profile extract if present and fresh, else None."""
+    try:
+        if time.time() - os.path.getmtime(cache_path) > CENSUS_PROFILE_CACHE_TTL_SECONDS:
+            return None
+        return pd.read_parquet(cache_path)
+    except (OSError, ValueError):
+        return None
 
 
 def fetch_via_census_profile(qa_signals: CensusQASignals) -> pd.DataFrame:
     profile_url = "https://www12.statcan.gc.ca/census-recensement/2021/dp-pd/prof/details/download-telecharger/comp/GetFile.cfm"
     params = {"Lang": "E", "FILETYPE": "CSV", "GEOLEVEL": "CSD", "PR": "46"}
     
-    response = requests.get(profile_url, params=params, timeout=90)
-    response.raise_for_status()
-    
-    qa_signals.add('api_response_status', response.status_code)
-    qa_signals.add('api_content_type', response.headers.get('Content-Type', 'unknown'))
-    
-    if response.headers.get('Content-Type') == 'application/zip' or response.content[:2] == b'PK':
-        qa_signals.add('file_format', 'ZIP')
-        return extract_census_from_zip(response.content, qa_signals)
-    else:
-        qa_signals.add('file_format', 'CSV')
-        df = pd.read_csv(StringIO(response.text), encoding='utf-8', encoding_errors='ignore', on_bad_lines='skip', low_memory=False)
-        return extract_census_characteristics(df, qa_signals)
+    # Stream the download to a spooled file (spills to disk past 8 MB) so the
+    # archive is never held in memory as bytes plus a BytesIO copy
+    with tempfile.SpooledTemporaryFile(max_size=8 << 20) as download:
+        with SESSION.get(profile_url, params=params, timeout=90, stream=True) as response:
+            response.raise_for_status()
+            
+            qa_signals.add('api_response_status', response.status_code)
+            qa_signals.add('api_content_type', response.headers.get('Content-Type', 'unknown'))
+            
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                download.write(chunk)
+            is_zip = response.headers.get('Content-Type') == 'application/zip'
+        
+        download.seek(0)
+        if is_zip or download.read(2) == b'PK':
+            qa_signals.add('file_format', 'ZIP')
+            download.seek(0)
+            return extract_census_from_zip(download, qa_signals)
+        else:
+            qa_signals.add('file_format', 'CSV')
+            download.seek(0)
+            df = read_census_profile(download)
+            return extract_census_characteristics(df, qa_signals)
 
 
-def extract_census_from_zip(zip_content: bytes, qa_signals: CensusQASignals) -> pd.DataFrame:
-    with zipfile.ZipFile(io.BytesIO(zip_content)) as zf:
+def extract_census_from_zip(zip_file: BinaryIO, qa_signals: CensusQASignals) -> pd.DataFrame:
+    with zipfile.ZipFile(zip_file) as zf:
         csv_files = [f for f in zf.namelist() if f.endswith('.csv')]
         if not csv_files:
             raise ValueError("No CSV files found in ZIP")
@@ -73,17 +150,29 @@ def extract_census_from_zip(zip_content: bytes, qa_signals: CensusQASignals) ->
         main_file = csv_files[0]
         qa_signals.add('extracted_file', main_file)
         with zf.open(main_file) as f:
-            df = pd.read_csv(f, encoding='utf-8', encoding_errors='ignore', on_bad_lines='skip', low_memory=False)
+            df = read_census_profile(f)
     return extract_census_characteristics(df, qa_signals)
 
 
+def read_census_profile(source) -> pd.DataFrame:
+    """Parse a Census Profile CSV, keeping only the columns we can use."""
+    return pd.read_csv(
+        source,
+        encoding='utf-8',
+        encoding_errors='ignore',
+        on_bad_lines='skip',
+        low_memory=False,
+        usecols=lambda col: col in _PROFILE_COLUMNS
+    )
+
+
 def extract_census_characteristics(df: pd.DataFrame, qa_signals: CensusQASignals) -> pd.DataFrame:
     qa_signals.add('raw_rows_downloaded', len(df))
     qa_signals.add('raw_columns', len(df.columns))
     available_cols = df.columns.tolist()
     
     char_col = None
-    for possible_name in ['CHARACTERISTIC_NAME', 'Characteristic', 'CHARACTERISTIC']:
+    for possible_name in _CHAR_COLUMNS:
         if possible_name in available_cols:
             char_col = possible_name
             break
@@ -91,19 +180,19 @@ def extract_census_characteristics(df: pd.DataFrame, qa_signals: CensusQASignals
         raise ValueError(f"Could not find characteristic column")
     
     geo_code_col = None
-    for possible in ['GEO_CODE (POR)', 'DGUID', 'GEO_CODE', 'GeoUID']:
+    for possible in _GEO_CODE_COLUMNS:
         if possible in available_cols:
             geo_code_col = possible
             break
     
     geo_name_col = None
-    for possible in ['GEO_NAME', 'Geographic name', 'GeoName']:
+    for possible in _GEO_NAME_COLUMNS:
         if possible in available_cols:
             geo_name_col = possible
             break
     
     data_col = None
-    for possible in ['C1_COUNT_TOTAL', 'Total', 'C1', 'VALUE']:
+    for possible in _DATA_COLUMNS:
         if possible in available_cols:
             data_col = possible
             break
@@ -124,10 +213,11 @@ def extract_census_characteristics(df: pd.DataFrame, qa_signals: CensusQASignals
     result = filtered[[geo_code_col, geo_name_col, char_col, data_col]].copy()
     result = result.rename(columns={geo_code_col: 'DGUID', geo_name_col: 'GEO_NAME', char_col: 'CHARACTERISTIC_NAME', data_col: 'C1_COUNT_TOTAL'})
     result['ALT_GEO_CODE'] = result['DGUID'].str.replace('2021A000', '', regex=False)
-    result['Geographic_name'] = result['GEO_NAME']
+    geo_names = result['GEO_NAME'].str.replace(_PROVINCE_SUFFIX_PATTERN, '', regex=True).str.strip()
+    result['Geographic_name'] = geo_names
     result['GEO_LEVEL'] = 'Census subdivision'
-    result['GEO_NAME'] = result['GEO_NAME'].str.replace(r',\s*Manitoba.*', '', regex=True).str.strip()
-    result['Geographic_name'] = result['Geographic_name'].str.replace(r',\s*Manitoba.*', '', regex=True).str.strip()
+    result['GEO_NAME'] = geo_names
+    result = result.astype(_CATEGORICAL_DTYPES)
     
     unique_communities = result['DGUID'].nunique()
     qa_signals.add('communities_extracted', unique_communities)
@@ -136,84 +226,90 @@ def extract_census_characteristics(df: pd.DataFrame, qa_signals: CensusQASignals
     return result
 
 
+# (DGUID, name, population, Indigenous population) per fallback community
+_FALLBACK_COMMUNITIES = (
+    # Major cities
+    ('2021A00054611040', 'Winnipeg', 749534, 92810),
+    ('2021A00054619039', 'Brandon', 51313, 5940),
+    ('2021A00054621058', 'Thompson', 13678, 7235),
+    ('2021A00054623042', 'The Pas', 5513, 3015),
+    ('2021A00054602034', 'Portage la Prairie', 13270, 1860),
+    ('2021A00054618044', 'Steinbach', 17806, 295),
+    ('2021A00054602067', 'Winkler', 13745, 160),
+    ('2021A00054622054', 'Selkirk', 10504, 2105),
+    ('2021A00054621072', 'Flin Flon', 4665, 1845),
+    ('2021A00054608069', 'Morden', 10250, 340),
+    
+    # Northern towns
+    ('2021A00054621056', 'Snow Lake', 723, 335),
+    ('2021A00054623048', 'Lynn Lake', 494, 290),
+    ('2021A00054621062', 'Leaf Rapids', 498, 255),
+    ('2021A00054621008', 'Gillam', 1265, 870),
+    ('2021A00054622006', 'Churchill', 870, 235),
+    ('2021A00054623040', 'Cormorant', 65, 45),
+    ('2021A00054623028', 'Bissett', 162, 85),
+    
+    # First Nations - Northern Region
+    ('2021S0504623801', 'Tataskweyak Cree Nation', 2982, 2935),  # Split Lake
+    ('2021S0504621801', 'Nisichawayasihk Cree Nation', 2873, 2825),  # Nelson House
+    ('2021S0504621803', 'O-Pipon-Na-Piwin Cree Nation', 1163, 1145),  # South Indian Lake
+    ('2021S0504621805', 'Mathias Colomb Cree Nation', 2060, 2025),  # Pukatawagan
+    ('2021S0504621807', 'Marcel Colomb First Nation', 568, 560),  # Black Sturgeon Falls
+    ('2021S0504623803', 'Pimicikamak Cree Nation', 6456, 6350),  # Cross Lake
+    ('2021S0504623824', 'Misipawistik Cree Nation', 1149, 1130),  # Grand Rapids
+    
+    # First Nations - Island Lake Region
+    ('2021S0504623807', 'Garden Hill First Nation', 4234, 4165),
+    ('2021S0504623809', 'St. Theresa Point First Nation', 3908, 3845),
+    ('2021S0504623811', 'Red Sucker Lake First Nation', 1192, 1175),
+    ('2021S0504623813', 'Wasagamack First Nation', 2289, 2250),
+    
+    # First Nations - Other
+    ('2021S0504621809', 'York Landing First Nation', 534, 525),
+    ('2021S0504622802', 'Black River First Nation', 1238, 1220),
+    ('2021S0504621802', 'Wuskwi Sipihk First Nation', 1892, 1860),  # Big Island Lake
+    
+    # Unincorporated communities
+    ('2021A00054623XXX', 'Herb Lake Landing', 142, 85),
+    ('2021A00054621XXX', 'Kelsey', 89, 50),
+    ('2021A00054623XXX', 'Granville Lake', 56, 35),
+    ('2021A00054621XXX', 'Schist Lake', 45, 25),
+    ('2021A00054623XXX', 'Sherridon', 58, 30),
+)
+
+_FALLBACK_CHARACTERISTICS = (
+    'Population, 2021',
+    'Total - Indigenous identity for the population in private households - 25% sample data',
+)
+
+
+@lru_cache(maxsize=1)
+def _fallback_census_df() -> pd.DataFrame:
+    """Build the fallback census rows (once per process)."""
+    dguids, names, pops, indigenous = zip(*_FALLBACK_COMMUNITIES)
+    
+    # Two rows per community, population first, as the API extract returns
+    dguid_col = pd.Series(np.repeat(dguids, 2), dtype='str')
+    name_col = pd.Series(np.repeat(names, 2), dtype='str')
+    return pd.DataFrame({
+        'DGUID': dguid_col,
+        'ALT_GEO_CODE': dguid_col.str.replace('2021A000', '', regex=False).str.replace('2021S050', '', regex=False),
+        'GEO_NAME': name_col,
+        'Geographic_name': name_col,
+        'GEO_LEVEL': 'Census subdivision',
+        'CHARACTERISTIC_NAME': np.tile(_FALLBACK_CHARACTERISTICS, len(dguids)),
+        'C1_COUNT_TOTAL': np.column_stack([pops, indigenous]).ravel(),
+    }).astype(_CATEGORICAL_DTYPES)
+
+
 def fetch_via_fallback(qa_signals: CensusQASignals) -> pd.DataFrame:
     """Fallback: Expanded dataset with First Nations and northern communities."""
     
-    communities = [
-        # Major cities
-        ('2021A00054611040', 'Winnipeg', 749534, 92810),
-        ('2021A00054619039', 'Brandon', 51313, 5940),
-        ('2021A00054621058', 'Thompson', 13678, 7235),
-        ('2021A00054623042', 'The Pas', 5513, 3015),
-        ('2021A00054602034', 'Portage la Prairie', 13270, 1860),
-        ('2021A00054618044', 'Steinbach', 17806, 295),
-        ('2021A00054602067', 'Winkler', 13745, 160),
-        ('2021A00054622054', 'Selkirk', 10504, 2105),
-        ('2021A00054621072', 'Flin Flon', 4665, 1845),
-        ('2021A00054608069', 'Morden', 10250, 340),
-        
-        # Northern towns
-        ('2021A00054621056', 'Snow Lake', 723, 335),
-        ('2021A00054623048', 'Lynn Lake', 494, 290),
-        ('2021A00054621062', 'Leaf Rapids', 498, 255),
-        ('2021A00054621008', 'Gillam', 1265, 870),
-        ('2021A00054622006', 'Churchill', 870, 235),
-        ('2021A00054623040', 'Cormorant', 65, 45),
-        ('2021A00054623028', 'Bissett', 162, 85),
-        
-        # First Nations - Northern Region
-        ('2021S0504623801', 'Tataskweyak Cree Nation', 2982, 2935),  # Split Lake
-        ('2021S0504621801', 'Nisichawayasihk Cree Nation', 2873, 2825),  # Nelson House
-        ('2021S0504621803', 'O-Pipon-Na-Piwin Cree Nation', 1163, 1145),  # South Indian Lake
-        ('2021S0504621805', 'Mathias Colomb Cree Nation', 2060, 2025),  # Pukatawagan
-        ('2021S0504621807', 'Marcel Colomb First Nation', 568, 560),  # Black Sturgeon Falls
-        ('2021S0504623803', 'Pimicikamak Cree Nation', 6456, 6350),  # Cross Lake
-        ('2021S0504623824', 'Misipawistik Cree Nation', 1149, 1130),  # Grand Rapids
-        
-        # First Nations - Island Lake Region
-        ('2021S0504623807', 'Garden Hill First Nation', 4234, 4165),
-        ('2021S0504623809', 'St. Theresa Point First Nation', 3908, 3845),
-        ('2021S0504623811', 'Red Sucker Lake First Nation', 1192, 1175),
-        ('2021S0504623813', 'Wasagamack First Nation', 2289, 2250),
-        
-        # First Nations - Other
-        ('2021S0504621809', 'York Landing First Nation', 534, 525),
-        ('2021S0504622802', 'Black River First Nation', 1238, 1220),
-        ('2021S0504621802', 'Wuskwi Sipihk First Nation', 1892, 1860),  # Big Island Lake
-        
-        # Unincorporated communities
-        ('2021A00054623XXX', 'Herb Lake Landing', 142, 85),
-        ('2021A00054621XXX', 'Kelsey', 89, 50),
-        ('2021A00054623XXX', 'Granville Lake', 56, 35),
-        ('2021A00054621XXX', 'Schist Lake', 45, 25),
-        ('2021A00054623XXX', 'Sherridon', 58, 30),
-    ]
-    
-    rows = []
-    for dguid, name, pop, indigenous in communities:
-        rows.append({
-            'DGUID': dguid,
-            'ALT_GEO_CODE': dguid.replace('2021A000', '').replace('2021S050', ''),
-            'GEO_NAME': name,
-            'Geographic_name': name,
-            'GEO_LEVEL': 'Census subdivision',
-            'CHARACTERISTIC_NAME': 'Population, 2021',
-            'C1_COUNT_TOTAL': pop
-        })
-        rows.append({
-            'DGUID': dguid,
-            'ALT_GEO_CODE': dguid.replace('2021A000', '').replace('2021S050', ''),
-            'GEO_NAME': name,
-            'Geographic_name': name,
-            'GEO_LEVEL': 'Census subdivision',
-            'CHARACTERISTIC_NAME': 'Total - Indigenous identity for the population in private households - 25% sample data',
-            'C1_COUNT_TOTAL': indigenous
-        })
-    
-    df = pd.DataFrame(rows)
-    qa_signals.add('communities_extracted', len(communities))
-    qa_signals.add('total_population', sum(c[2] for c in communities))
-    qa_signals.add('total_indigenous_population', sum(c[3] for c in communities))
+    # Shallow copy so callers adding columns don't alter the cached frame
+    df = _fallback_census_df().copy(deep=False)
+    qa_signals.add('communities_extracted', len(_FALLBACK_COMMUNITIES))
+    qa_signals.add('total_population', sum(c[2] for c in _FALLBACK_COMMUNITIES))
+    qa_signals.add('total_indigenous_population', sum(c[3] for c in _FALLBACK_COMMUNITIES))
     qa_signals.add('fallback_dataset_used', True)
     qa_signals.add('fallback_limitation', 'Expanded dataset with 33 communities including First Nations')
-    return df
\ No newline at end of file
+    return df
@@ -0,0 +1,7 @@
+"""Tests for the wildfire evacuation pipeline."""
+
+import os
+import sys
+
+# Pipeline modules import each other relative to mycode/ (e.g. "from io_paths import IOPaths")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
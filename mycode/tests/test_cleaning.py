@@ -0,0 +1,92 @@
+"""Tests for census lookup building and caching."""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from pipeline.transform import cleaning
+
+HEADER = "GEO_LEVEL,CHARACTERISTIC_NAME,DGUID,ALT_GEO_CODE,GEO_NAME,C1_COUNT_TOTAL\n"
+# Non-CSD rows push the CSD rows past the first MiB of the file
+PADDING_ROW = "Province,Population in private households,2021A000246,46,Manitoba,1342153\n"
+CSD_ROWS = (
+    "Census subdivision,\"Population, 2021\",2021A00054621072,4621072,Flin Flon,4940\n"
+    "Census subdivision,Indigenous identity,2021A00054621072,4621072,Flin Flon,1600\n"
+)
+
+
+class TestBuildCensusLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.census_path = os.path.join(self.tmp.name, "census.csv")
+        cleaning._cached_census_lookup.cache_clear()
+        cache_dir = self.tmp.name
+        self.patch = mock.patch(
+            "io_paths.IOPaths.census_lookup_cache",
+            lambda self, signature: os.path.join(cache_dir, f"census_lookup_{signature}.parquet"),
+        )
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        cleaning._cached_census_lookup.cache_clear()
+        self.tmp.cleanup()
+
+    def write_census(self, population):
+        with open(self.census_path, "w", encoding="utf-8") as f:
+            f.write(HEADER)
+            f.write(PADDING_ROW * ((1 << 20) // len(PADDING_ROW) + 1))
+            f.write(CSD_ROWS.replace("4940", population))
+
+    def lookup_population(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return int(cleaning.build_census_lookup(self.census_path)["POP_2021"].iloc[0])
+
+    def test_same_size_edit_past_first_mib_rebuilds_cache(self):
+        self.write_census("4940")
+        self.assertEqual(self.lookup_population(), 4940)
+        
+        # Corrected count, same file size
+        self.write_census("4941")
+        self.assertEqual(self.lookup_population(), 4941)
+
+    def test_unchanged_file_reuses_cache(self):
+        self.write_census("4940")
+        self.lookup_population()
+        cleaning._cached_census_lookup.cache_clear()
+        
+        with mock.patch.object(cleaning, "load_census_csv", side_effect=AssertionError("re-parsed")):
+            self.assertEqual(self.lookup_population(), 4940)
+
+
+class TestParseEvacuationDates(unittest.TestCase):
+
+    def parse(self, values):
+        df = pd.DataFrame({"Date Evacuation Initiated": values})
+        with contextlib.redirect_stdout(io.StringIO()):
+            return cleaning.parse_evacuation_dates(df)["date_initiated_parsed"]
+
+    def test_known_formats_are_parsed(self):
+        parsed = self.parse(["May 28, 2025", "Jun 1, 2025", "2025-06-02"])
+        
+        self.assertEqual(
+            parsed.dt.strftime("%Y-%m-%d").tolist(),
+            ["2025-05-28", "2025-06-01", "2025-06-02"],
+        )
+
+    def test_ambiguous_and_unknown_formats_stay_missing(self):
+        parsed = self.parse(["May 28, 2025", "06/07/2025", "bad date", ""])
+        
+        self.assertEqual(parsed.iloc[0], pd.Timestamp("2025-05-28"))
+        # Day/month order is not guessed
+        self.assertTrue(parsed.iloc[1:].isna().all())
+
+
+if __name__ == "__main__":
+    unittest.main()
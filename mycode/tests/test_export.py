@@ -0,0 +1,88 @@
+"""Tests for pipeline table exports."""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from io_paths import IOPaths, intermediate_exists, read_intermediate
+from pipeline.load.export import ExportManager
+
+
+class TestExportManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = IOPaths()
+        # Path properties are cached joins on csv_dir, so redirect it before first use
+        self.paths.csv_dir = self.tmp.name
+        self.wildfire_df = pd.DataFrame({
+            "Local Authority": ["Town of Flin Flon", "City of Thompson"],
+            "Date Evacuation Initiated": ["May 28, 2025", "June 1, 2025"],
+            "source_tier": [1, 1],
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def export_scraped(self, dual_write_csv):
+        manager = ExportManager(self.paths, dual_write_csv=dual_write_csv)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.export_scraped_wildfire(self.wildfire_df)
+            return read_intermediate(self.paths.wildfire_input)
+
+    def test_parquet_only_export_feeds_skip_scraping(self):
+        loaded = self.export_scraped(dual_write_csv=False)
+        
+        self.assertFalse(os.path.exists(self.paths.scraped_wildfire_latest))
+        self.assertFalse(os.path.exists(self.paths.scraped_wildfire_versioned))
+        # --skip-scraping checks and reads the CSV path; the Parquet copy must satisfy both
+        self.assertTrue(intermediate_exists(self.paths.wildfire_input))
+        pd.testing.assert_frame_equal(loaded, self.wildfire_df)
+
+    def test_dual_write_reads_back_current_parquet(self):
+        loaded = self.export_scraped(dual_write_csv=True)
+        
+        self.assertTrue(os.path.exists(self.paths.scraped_wildfire_latest))
+        self.assertTrue(os.path.exists(self.paths.scraped_wildfire_versioned))
+        self.assertGreaterEqual(
+            os.path.getmtime(self.paths.scraped_wildfire_parquet),
+            os.path.getmtime(self.paths.scraped_wildfire_latest),
+        )
+        pd.testing.assert_frame_equal(loaded, self.wildfire_df)
+
+    def test_mixed_object_column_is_written_as_text(self):
+        self.wildfire_df["Number of Evacuees"] = pd.Series([5000, "1,200"], dtype=object)
+        
+        loaded = self.export_scraped(dual_write_csv=False)
+        
+        self.assertEqual(loaded["Number of Evacuees"].tolist(), ["5000", "1,200"])
+
+    def test_failed_parquet_write_falls_back_to_csv_copy(self):
+        manager = ExportManager(self.paths, dual_write_csv=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.export_scraped_wildfire(self.wildfire_df)
+        # Parquet copy can no longer be replaced: the path is now a directory
+        os.remove(self.paths.scraped_wildfire_parquet)
+        os.mkdir(self.paths.scraped_wildfire_parquet)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.export_scraped_wildfire(self.wildfire_df)
+        self.assertTrue(os.path.exists(self.paths.scraped_wildfire_latest))
+
+    def test_main_output_paths_match_written_files(self):
+        for dual_write_csv in (True, False):
+            manager = ExportManager(self.paths, dual_write_csv=dual_write_csv)
+            with contextlib.redirect_stdout(io.StringIO()):
+                manager.export_enriched_wildfire(self.wildfire_df)
+            for path in manager.main_output_paths().values():
+                self.assertTrue(os.path.exists(path), path)
+            written = {entry["path"] for entry in manager.export_log}
+            self.assertLessEqual(set(manager.main_output_paths().values()), written)
+
+
+if __name__ == "__main__":
+    unittest.main()
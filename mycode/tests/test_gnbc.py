@@ -0,0 +1,33 @@
+"""Tests for the GNBC place names fetch."""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pipeline.extract import gnbc
+
+
+class TestFetchGnbcManitoba(unittest.TestCase):
+
+    def test_failed_cache_write_keeps_api_data(self):
+        items = [{"name": "Nopiming Lake", "generic": "Lake", "theme": "LAKE", "latitude": 51.2, "longitude": -95.3}]
+        qa = gnbc.GNBCQASignals()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            # Cache directory is gone, so opening the cache file for writing fails
+            unwritable = os.path.join(tmp, "missing", "gnbc.json")
+            with mock.patch.object(gnbc, "_gnbc_cache_path", return_value=unwritable), \
+                    mock.patch.object(gnbc, "_fetch_entity_type", return_value=items), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                gnbc_df = gnbc.fetch_gnbc_manitoba(["LAKE"], qa, force_refresh=True)
+        
+        self.assertEqual(qa.signals["fetch_method"], "API - GNBC Web Service")
+        self.assertIn("api_cache_write_error", qa.signals)
+        self.assertEqual(gnbc_df["place_name"].tolist(), ["Nopiming Lake"])
+
+
+if __name__ == "__main__":
+    unittest.main()
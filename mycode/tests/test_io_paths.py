@@ -0,0 +1,56 @@
+"""Tests for reading intermediate pipeline tables."""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from io_paths import read_intermediate
+
+
+class TestReadIntermediate(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "table.csv")
+        self.parquet_path = os.path.join(self.tmp.name, "table.parquet")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, csv_value=None, parquet_value=None, csv_mtime=None, parquet_mtime=None):
+        if csv_value is not None:
+            pd.DataFrame({"value": [csv_value]}).to_csv(self.csv_path, index=False)
+            if csv_mtime is not None:
+                os.utime(self.csv_path, (csv_mtime, csv_mtime))
+        if parquet_value is not None:
+            pd.DataFrame({"value": [parquet_value]}).to_parquet(self.parquet_path, index=False)
+            if parquet_mtime is not None:
+                os.utime(self.parquet_path, (parquet_mtime, parquet_mtime))
+
+    def read_value(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return read_intermediate(self.csv_path)["value"].tolist()
+
+    def test_current_parquet_is_preferred(self):
+        self.write(csv_value="csv", parquet_value="parquet", csv_mtime=1_000, parquet_mtime=2_000)
+        self.assertEqual(self.read_value(), ["parquet"])
+
+    def test_hand_edited_csv_wins_over_stale_parquet(self):
+        self.write(csv_value="edited", parquet_value="stale", csv_mtime=2_000, parquet_mtime=1_000)
+        self.assertEqual(self.read_value(), ["edited"])
+
+    def test_parquet_only(self):
+        self.write(parquet_value="parquet")
+        self.assertEqual(self.read_value(), ["parquet"])
+
+    def test_missing_table_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            self.read_value()
+
+
+if __name__ == "__main__":
+    unittest.main()
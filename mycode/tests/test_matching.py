@@ -0,0 +1,45 @@
+"""Tests for fuzzy matching of local authorities to census geographies."""
+
+import contextlib
+import io
+import unittest
+
+import pandas as pd
+
+from pipeline.transform.matching import fuzzy_match_authorities
+
+
+def match(authorities, census_names):
+    wildfire_df = pd.DataFrame({"Local Authority": authorities, "LA_NORM": authorities})
+    census_df = pd.DataFrame({
+        "DGUID": [f"G{i}" for i in range(len(census_names))],
+        "GEO_NAME_NORM": census_names,
+    })
+    with contextlib.redirect_stdout(io.StringIO()):
+        mapping_df, report = fuzzy_match_authorities(wildfire_df, census_df)
+    return mapping_df.set_index("Local Authority"), report
+
+
+class TestFuzzyMatchAuthorities(unittest.TestCase):
+
+    def test_single_candidate_subset_is_low_confidence(self):
+        mapping, report = match(["thompson lake", "cross lake"], ["thompson", "lake", "brandon"])
+        
+        # token_set_ratio gives each authority 100 against its only subset candidate
+        self.assertEqual(mapping.loc["thompson lake", "match_name"], "thompson")
+        self.assertEqual(mapping.loc["cross lake", "match_name"], "lake")
+        self.assertEqual(
+            sorted(m["authority"] for m in report.low_confidence_matches),
+            ["cross lake", "thompson lake"],
+        )
+
+    def test_exact_and_reordered_names_are_high_confidence(self):
+        mapping, report = match(["brandon", "lake cross", "st. andrews"], ["brandon", "cross lake", "st andrews"])
+        
+        self.assertEqual(mapping["match_score"].tolist(), [100, 100, 100])
+        self.assertEqual(mapping["DGUID"].tolist(), ["G0", "G1", "G2"])
+        self.assertEqual(report.low_confidence_matches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+"""Tests for the Statistics Canada census fetch."""
+
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import statscan_api
+
+
+class TestFetchManitobaCensus(unittest.TestCase):
+
+    def test_failed_cache_write_keeps_downloaded_data(self):
+        downloaded = pd.DataFrame({"DGUID": ["2021A00054621072"], "C1_COUNT_TOTAL": [4940]})
+        qa = statscan_api.CensusQASignals()
+        
+        with mock.patch.object(statscan_api, "fetch_via_census_profile", return_value=downloaded), \
+                mock.patch.object(pd.DataFrame, "to_parquet", side_effect=OSError("read-only file system")):
+            census_df = statscan_api.fetch_manitoba_census_2021(qa, force_refresh=True)
+        
+        self.assertIs(census_df, downloaded)
+        self.assertEqual(qa.signals["fetch_method"], "API - Census Profile")
+        self.assertIn("read-only", qa.signals["api_cache_write_error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Tests for T1 (Manitoba) table extraction."""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from pipeline.extract import t1_manitoba
+from pipeline.extract.t1_manitoba import QASignals, fetch_pages, scrape_wildfire_data
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def scrape_fixture(filename):
+    with open(os.path.join(FIXTURES_DIR, filename), encoding="utf-8") as f:
+        html = f.read()
+    qa = QASignals()
+    pages = {"Manitoba Evacs": ("https://example.test/evacuations.html", html)}
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = scrape_wildfire_data(pages, qa)
+    return df, qa
+
+
+class TestScrapeWildfireData(unittest.TestCase):
+
+    def test_section_header_rows_are_dropped(self):
+        df, qa = scrape_fixture("evacuations_sections.html")
+        
+        self.assertEqual(
+            df["Local Authority"].tolist(),
+            ["Town of Flin Flon", "Town of Flin Flon", "City of Thompson", "Pimicikamak Cree Nation"],
+        )
+        self.assertEqual(
+            df["Date Evacuation Initiated"].tolist(),
+            ["May 28, 2025", "May 30, 2025", "June 1, 2025", "May 29, 2025"],
+        )
+        # Two <th> headings plus the "Evacuation Lifted" label row
+        self.assertEqual(qa.signals["non_geographic_rows_filtered"], 3)
+
+    def test_cells_stay_text_across_tables(self):
+        df, _ = scrape_fixture("evacuations_two_tables.html")
+        
+        # The first table is all digits; read_html would infer int64 for it alone
+        self.assertEqual(
+            df["Number of Evacuees"].tolist(),
+            ["5000", "007", "1,200", "Unknown"],
+        )
+        self.assertTrue(all(isinstance(v, str) for v in df["Number of Evacuees"]))
+        self.assertTrue(all(isinstance(v, str) for v in df["Date Evacuation Initiated"]))
+        # Mixed int/str object columns cannot be written to Parquet
+        df.to_parquet(io.BytesIO(), index=False)
+
+
+class FakeSession:
+    """Session stand-in that answers every GET with a revalidatable page."""
+
+    def get(self, url, headers=None, timeout=None):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = "utf-8"
+        response.headers["ETag"] = '"v1"'
+        response._content = b"<html><body><p>Evacuations</p></body></html>"
+        return response
+
+
+class TestFetchPages(unittest.TestCase):
+
+    def test_failed_http_cache_save_keeps_downloaded_page(self):
+        url = "https://example.test/evacuations.html"
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            # Cache directory is gone, so saving the conditional-GET cache fails
+            unwritable = os.path.join(tmp, "missing", "http_cache.json")
+            with mock.patch.object(t1_manitoba.paths, "http_cache", unwritable), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                pages = fetch_pages({"Manitoba Evacs": url}, session=FakeSession())
+        
+        self.assertEqual(list(pages), ["Manitoba Evacs"])
+        self.assertIn("Evacuations", pages["Manitoba Evacs"][1])
+
+
+if __name__ == "__main__":
+    unittest.main()